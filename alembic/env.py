@@ -13,6 +13,8 @@ from alembic import context
 # Import Base and all models
 from app.infra.database import Base
 # Import all models here so Alembic can detect them
+from app.infra.repositories.blob import BlobModel  # noqa: F401
+from app.infra.repositories.corpus_version import CorpusVersionModel  # noqa: F401
 from app.infra.repositories.document import DocumentModel  # noqa: F401
 
 # Get database URL from database.py and convert async URL to sync for Alembic
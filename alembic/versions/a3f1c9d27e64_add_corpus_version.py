@@ -0,0 +1,46 @@
+"""Add corpus version
+
+Revision ID: a3f1c9d27e64
+Revises: 16b7dec2bc4c
+Create Date: 2026-10-19 14:05:17.284106
+
+"""
+import uuid
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f1c9d27e64'
+down_revision: Union[str, Sequence[str], None] = '16b7dec2bc4c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    corpus_version = op.create_table('corpus_version',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('epoch', sa.String(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.bulk_insert(corpus_version, [{
+        'id': 1,
+        'epoch': uuid.uuid4().hex[:12],
+        'version': 1,
+        'updated_at': datetime.now(timezone.utc),
+    }])
+    with op.batch_alter_table('documents') as batch_op:
+        batch_op.create_index('ix_documents_uploaded_at', ['uploaded_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('documents') as batch_op:
+        batch_op.drop_index('ix_documents_uploaded_at')
+    op.drop_table('corpus_version')
@@ -1,5 +1,6 @@
 """API layer package."""
 
+from app.api.admin.admin import router as admin_router
 from app.api.document.document import router as document_router
 
-__all__ = ["document_router"]
+__all__ = ["admin_router", "document_router"]
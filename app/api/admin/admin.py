@@ -0,0 +1,221 @@
+import asyncio
+import logging
+import os
+import secrets
+import shutil
+import tempfile
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, File, Header, HTTPException, UploadFile
+from fastapi.responses import FileResponse, JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.background import BackgroundTask
+
+from app.business.index import MigrateIndexUseCase
+from app.business.snapshot import ExportSnapshotUseCase, ImportSnapshotUseCase
+from app.domain.config import settings
+from app.domain.dto.request import MigrateIndexRequest
+from app.infra.database import async_session_maker, get_db
+from app.infra.gateway import GeminiGateway, IndexMigration, IndexMigrationError, get_gemini_gateway
+from app.infra.metrics import metrics
+from app.infra.repositories import BlobRepository, DocumentRepository
+from app.infra.snapshot import SnapshotError
+from app.infra.storage import BlobStore
+
+
+async def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Guard admin endpoints with ADMIN_TOKEN; they are disabled without one."""
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled; set ADMIN_TOKEN to enable them")
+    if x_admin_token is None or not secrets.compare_digest(
+        x_admin_token.encode(), settings.ADMIN_TOKEN.encode()
+    ):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    dependencies=[Depends(require_admin)],
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Index migration jobs started by this process, referenced until they finish
+_migration_jobs = set()
+
+
+def _remove(path: str):
+    if os.path.exists(path):
+        os.remove(path)
+
+
+@router.get("/metrics", summary="Show stage timings and counters")
+async def get_metrics():
+    return JSONResponse(status_code=200, content=metrics.snapshot())
+
+
+@router.post("/snapshots/export", summary="Export a vector index snapshot")
+async def export_snapshot(
+    since: Optional[datetime] = None,
+    base_snapshot_id: Optional[str] = None,
+    session: AsyncSession = Depends(get_db),
+    gemini_gateway: GeminiGateway = Depends(get_gemini_gateway),
+):
+    fd, path = tempfile.mkstemp(suffix=".snap")
+    os.close(fd)
+    try:
+        export_snapshot_use_case = ExportSnapshotUseCase(DocumentRepository(session), gemini_gateway)
+        manifest = await export_snapshot_use_case.execute(
+            path, since=since, base_snapshot_id=base_snapshot_id
+        )
+    except Exception as e:
+        _remove(path)
+        raise HTTPException(status_code=500, detail=f"Snapshot export failed: {str(e)}")
+
+    return FileResponse(
+        path,
+        media_type="application/zstd",
+        filename=f"snapshot-{manifest['snapshot_id']}.snap",
+        headers={
+            "X-Snapshot-Id": manifest["snapshot_id"],
+            "X-Snapshot-As-Of": manifest["as_of"],
+        },
+        background=BackgroundTask(_remove, path),
+    )
+
+
+@router.post("/snapshots/import", summary="Import a vector index snapshot")
+async def import_snapshot(
+    file: UploadFile = File(...),
+    verify: bool = True,
+    session: AsyncSession = Depends(get_db),
+    gemini_gateway: GeminiGateway = Depends(get_gemini_gateway),
+):
+    fd, path = tempfile.mkstemp(suffix=".snap")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            await asyncio.to_thread(shutil.copyfileobj, file.file, out)
+
+        import_snapshot_use_case = ImportSnapshotUseCase(
+            DocumentRepository(session), gemini_gateway, BlobStore(BlobRepository(session))
+        )
+        report = await import_snapshot_use_case.execute(path, verify=verify)
+        return JSONResponse(status_code=200, content=report)
+    except SnapshotError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Snapshot import failed: {str(e)}")
+    finally:
+        _remove(path)
+
+
+async def _run_migration(
+    gemini_gateway: GeminiGateway,
+    migration: IndexMigration,
+    max_chunks_per_second: Optional[float],
+):
+    # Runs past the request, so it needs its own session; failures are
+    # recorded in the index registry and reported by GET /admin/index
+    async with async_session_maker() as session:
+        migrate_index_use_case = MigrateIndexUseCase(DocumentRepository(session), gemini_gateway)
+        await migrate_index_use_case.run(migration, max_chunks_per_second)
+
+
+def _start_migration_job(
+    migrate_index_use_case: MigrateIndexUseCase,
+    max_chunks_per_second: Optional[float],
+):
+    migration = migrate_index_use_case.claim()
+    job = asyncio.create_task(
+        _run_migration(migrate_index_use_case.gemini_gateway, migration, max_chunks_per_second)
+    )
+    _migration_jobs.add(job)
+    job.add_done_callback(_migration_jobs.discard)
+    job.add_done_callback(_log_migration_failure)
+
+
+def _log_migration_failure(job: asyncio.Task):
+    # Nobody awaits the job; failures inside the run are also recorded in the registry
+    if job.cancelled() or job.exception() is None:
+        return
+    error = job.exception()
+    logger.error("Index migration job failed", exc_info=(type(error), error, error.__traceback__))
+
+
+@router.get("/index", summary="Show index versions and migration progress")
+async def index_status(
+    session: AsyncSession = Depends(get_db),
+    gemini_gateway: GeminiGateway = Depends(get_gemini_gateway),
+):
+    migrate_index_use_case = MigrateIndexUseCase(DocumentRepository(session), gemini_gateway)
+    return JSONResponse(status_code=200, content=migrate_index_use_case.status())
+
+
+@router.post("/index/migrations", status_code=202, summary="Re-embed the corpus into a new index version")
+async def start_index_migration(
+    request: MigrateIndexRequest,
+    session: AsyncSession = Depends(get_db),
+    gemini_gateway: GeminiGateway = Depends(get_gemini_gateway),
+):
+    migrate_index_use_case = MigrateIndexUseCase(DocumentRepository(session), gemini_gateway)
+    try:
+        migrate_index_use_case.start(**request.model_dump(exclude={"max_chunks_per_second"}))
+        _start_migration_job(migrate_index_use_case, request.max_chunks_per_second)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except IndexMigrationError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return JSONResponse(status_code=202, content=migrate_index_use_case.status())
+
+
+@router.post("/index/migrations/resume", status_code=202, summary="Resume a paused or failed index migration")
+async def resume_index_migration(
+    max_chunks_per_second: Optional[float] = None,
+    session: AsyncSession = Depends(get_db),
+    gemini_gateway: GeminiGateway = Depends(get_gemini_gateway),
+):
+    migrate_index_use_case = MigrateIndexUseCase(DocumentRepository(session), gemini_gateway)
+    try:
+        _start_migration_job(migrate_index_use_case, max_chunks_per_second)
+    except IndexMigrationError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return JSONResponse(status_code=202, content=migrate_index_use_case.status())
+
+
+@router.post("/index/migrations/pause", summary="Pause the index migration after the current document")
+async def pause_index_migration(
+    session: AsyncSession = Depends(get_db),
+    gemini_gateway: GeminiGateway = Depends(get_gemini_gateway),
+):
+    migrate_index_use_case = MigrateIndexUseCase(DocumentRepository(session), gemini_gateway)
+    try:
+        migrate_index_use_case.pause()
+    except IndexMigrationError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return JSONResponse(status_code=200, content=migrate_index_use_case.status())
+
+
+@router.delete("/index/migrations", summary="Abort the index migration and drop its collection")
+async def abort_index_migration(
+    session: AsyncSession = Depends(get_db),
+    gemini_gateway: GeminiGateway = Depends(get_gemini_gateway),
+):
+    migrate_index_use_case = MigrateIndexUseCase(DocumentRepository(session), gemini_gateway)
+    try:
+        await asyncio.to_thread(migrate_index_use_case.abort)
+    except IndexMigrationError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return JSONResponse(status_code=200, content=migrate_index_use_case.status())
+
+
+@router.delete("/index/retired", summary="Drop collections of replaced index versions")
+async def drop_retired_indexes(
+    session: AsyncSession = Depends(get_db),
+    gemini_gateway: GeminiGateway = Depends(get_gemini_gateway),
+):
+    migrate_index_use_case = MigrateIndexUseCase(DocumentRepository(session), gemini_gateway)
+    dropped = await asyncio.to_thread(migrate_index_use_case.drop_retired)
+    return JSONResponse(status_code=200, content={"dropped_versions": dropped})
@@ -0,0 +1,58 @@
+from typing import Awaitable, Callable, Hashable, Optional
+
+import orjson
+from fastapi import Response
+
+from app.domain.config import settings
+from app.infra.response_cache import ResponseCache
+
+
+def cache_headers(etag: str) -> dict:
+    if settings.CACHE_MAX_AGE > 0:
+        cache_control = f"max-age={settings.CACHE_MAX_AGE}, must-revalidate"
+    else:
+        # Clients may store the response but must revalidate it with If-None-Match
+        cache_control = "no-cache"
+    return {"ETag": etag, "Cache-Control": cache_control}
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses weak comparison, so W/ prefixes are ignored."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified(if_none_match: Optional[str], etag: str) -> Optional[Response]:
+    """A 304 response when the client's copy is current, else None."""
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=cache_headers(etag))
+    return None
+
+
+async def cached_json(
+    cache: ResponseCache,
+    key: Hashable,
+    render: Callable[[], Awaitable[object]],
+) -> bytes:
+    """JSON body for ``key``, serialized with orjson and cached on a miss.
+
+    Keys must include the version the content was rendered at.
+    """
+    if cache.enabled:
+        body = cache.get(key)
+        if body is not None:
+            return body
+    body = orjson.dumps(await render())
+    cache.put(key, body)
+    return body
+
+
+def json_response(body: bytes, etag: str) -> Response:
+    """Serve pre-serialized JSON with its validators."""
+    return Response(content=body, media_type="application/json", headers=cache_headers(etag))
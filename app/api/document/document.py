@@ -1,14 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.caching import cached_json, json_response, not_modified
+from app.business.document.delete_document import DeleteDocumentUseCase
 from app.business.document.save_document import SaveDocumentUseCase
 from app.business.document.list_documents import ListDocumentsUseCase
 from app.business.talk.retrieve_info import RetrieveInfoUseCase
 from app.domain.dto.request import RetrieveInfoRequest, UploadDocumentRequest
+from app.domain.dto.response import ListDocumentsResponse
 from app.infra.database import get_db
-from app.infra.gateway import GeminiGateway
-from app.infra.repositories import DocumentRepository
+from app.infra.deadline import Deadline, DeadlineExceeded, RequestCancelled, get_deadline
+from app.infra.extractors import UnsupportedDocumentTypeError
+from app.infra.gateway import GeminiGateway, get_gemini_gateway
+from app.infra.repositories import BlobRepository, DocumentRepository
+from app.infra.response_cache import response_cache
+from app.infra.storage import BlobStore
 
 router = APIRouter(
     prefix="/documents",
@@ -16,18 +25,30 @@ router = APIRouter(
 )
 
 
+def _cancelled(error: RequestCancelled) -> HTTPException:
+    # 499 is the de facto status for requests closed by the client
+    status_code = 504 if isinstance(error, DeadlineExceeded) else 499
+    return HTTPException(status_code=status_code, detail=str(error))
+
+
 @router.post("/upload", response_model=dict, summary="Upload a new document")
 async def upload_document(
     request: UploadDocumentRequest = Depends(UploadDocumentRequest.as_form),
     session: AsyncSession = Depends(get_db),
+    gemini_gateway: GeminiGateway = Depends(get_gemini_gateway),
+    deadline: Deadline = Depends(get_deadline),
 ):
     try:
         document_repository = DocumentRepository(session)
-        gemini_gateway = GeminiGateway()
-        save_document_use_case = SaveDocumentUseCase(document_repository, gemini_gateway)
+        blob_store = BlobStore(BlobRepository(session))
+        save_document_use_case = SaveDocumentUseCase(document_repository, gemini_gateway, blob_store)
         
-        response = await save_document_use_case.execute(request)
+        response = await save_document_use_case.execute(request, deadline)
         return JSONResponse(status_code=201, content=response.model_dump())
+    except UnsupportedDocumentTypeError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    except RequestCancelled as e:
+        raise _cancelled(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
@@ -35,35 +56,73 @@ async def upload_document(
 @router.post("/talk", response_model=dict, summary="Talk to the documents")
 async def retrieve(
     request: RetrieveInfoRequest,
+    gemini_gateway: GeminiGateway = Depends(get_gemini_gateway),
+    deadline: Deadline = Depends(get_deadline),
 ):
     try:
-        gemini_gateway = GeminiGateway()
         retrieve_info_use_case = RetrieveInfoUseCase(gemini_gateway)
 
-        response = await retrieve_info_use_case.execute(message=request.message)
+        response = await retrieve_info_use_case.execute(message=request.message, deadline=deadline)
 
         return JSONResponse(status_code=201, content=response.model_dump())
+    except RequestCancelled as e:
+        raise _cancelled(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Retrieve failed: {str(e)}")
 
 
-@router.get("/", summary="List all uploaded documents")
+@router.get("/", response_model=ListDocumentsResponse, summary="List all uploaded documents")
 async def list_documents(
     page: int = 1,
     limit: int = 10,
+    if_none_match: Optional[str] = Header(None),
     session: AsyncSession = Depends(get_db),
 ):
+    if page < 1:
+        raise HTTPException(status_code=400, detail="page must be >= 1")
+    if limit < 1 or limit > 100:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 100")
+
     try:
-        if page < 1:
-            raise HTTPException(status_code=400, detail="page must be >= 1")
-        if limit < 1 or limit > 100:
-            raise HTTPException(status_code=400, detail="limit must be between 1 and 100")
-        
         document_repository = DocumentRepository(session)
         list_documents_use_case = ListDocumentsUseCase(document_repository)
-        
-        response = await list_documents_use_case.execute(page=page, limit=limit)
-        return JSONResponse(status_code=200, content=response.model_dump())
+
+        # The ETag is the corpus version, which changes with every upload,
+        # delete or import; a matching client gets 304 without a page query
+        version = await list_documents_use_case.version()
+        etag = f'"{version}"'
+        response = not_modified(if_none_match, etag)
+        if response is not None:
+            return response
+
+        # A page read after its version may be newer than the version says,
+        # never older, so caching it under that version is safe
+        body = await cached_json(
+            response_cache,
+            ("documents", page, limit, version),
+            lambda: list_documents_use_case.execute(page=page, limit=limit),
+        )
+        return json_response(body, etag)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list documents: {str(e)}")
+
+
+@router.delete("/{document_id}", status_code=204, summary="Delete a document")
+async def delete_document(
+    document_id: str,
+    session: AsyncSession = Depends(get_db),
+    gemini_gateway: GeminiGateway = Depends(get_gemini_gateway),
+):
+    try:
+        document_repository = DocumentRepository(session)
+        blob_store = BlobStore(BlobRepository(session))
+        delete_document_use_case = DeleteDocumentUseCase(document_repository, gemini_gateway, blob_store)
+
+        deleted = await delete_document_use_case.execute(document_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Delete failed: {str(e)}")
+
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Document not found")
+    return Response(status_code=204)
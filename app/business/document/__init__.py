@@ -1,4 +1,4 @@
+from .delete_document import DeleteDocumentUseCase
 from .save_document import SaveDocumentUseCase
 
-__all__ = ["SaveDocumentUseCase"]
-
+__all__ = ["DeleteDocumentUseCase", "SaveDocumentUseCase"]
@@ -0,0 +1,42 @@
+import asyncio
+import os
+
+from app.infra.gateway import GeminiGateway
+from app.infra.repositories import DocumentRepository
+from app.infra.storage import BlobStore
+
+
+class DeleteDocumentUseCase:
+    def __init__(self,
+        document_repository: DocumentRepository,
+        gemini_gateway: GeminiGateway,
+        blob_store: BlobStore,
+        ):
+        self.document_repository = document_repository
+        self.gemini_gateway = gemini_gateway
+        self.blob_store = blob_store
+
+    async def execute(self, document_id: str) -> bool:
+        document = await self.document_repository.get_by_id(document_id)
+        if document is None:
+            return False
+
+        # Chunks go first: if the row delete then fails, the document is still
+        # listed and a retried delete finishes the job. The other order could
+        # leave chunks of a deleted document answering queries, with no row
+        # left to delete them through.
+        await asyncio.to_thread(self.gemini_gateway.delete_document, document.id)
+
+        # The row and the blob reference go in one transaction; a concurrent
+        # delete that got there first leaves the reference to it. The stored
+        # file is only removed once no other document references it.
+        deleted = await self.document_repository.delete(
+            document.id, on_blob_unused=self.blob_store.remove_file
+        )
+        if not deleted:
+            return False
+
+        if not document.content_hash and os.path.exists(document.filepath):
+            # Uploads from before blob storage are never shared
+            os.remove(document.filepath)
+        return True
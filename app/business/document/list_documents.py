@@ -1,37 +1,43 @@
 from typing import List
 
-from app.domain.dto.response import ListDocumentsResponse
 from app.domain.dto.response.list_documents import DocumentListItem
 from app.domain.entities import Document
 from app.infra.repositories import DocumentRepository
 
+# Item fields are taken from the DTO so the two cannot drift apart
+_ITEM_FIELDS = tuple(DocumentListItem.model_fields)
+
 
 class ListDocumentsUseCase:
+    """Read a page of documents in the shape of ``ListDocumentsResponse``.
+
+    Items are plain dicts rather than models, so the API layer can serialize
+    a page with orjson without validating every row.
+    """
+
     def __init__(self, document_repository: DocumentRepository):
         self.document_repository = document_repository
 
-    async def execute(self, page: int = 1, limit: int = 10) -> ListDocumentsResponse:
-        documents = await self.document_repository.get_all()
-        
-        # Apply pagination
-        start_idx = (page - 1) * limit
-        end_idx = start_idx + limit
-        paginated_documents = documents[start_idx:end_idx]
-        
-        document_items = [
-            DocumentListItem(
-                id=doc.id,
-                filename=doc.filename,
-                uploaded_at=doc.uploaded_at.isoformat() if doc.uploaded_at else "",
-                mimetype=doc.mimetype,
-                size=doc.size,
-                description=doc.description,
-            ) for doc in paginated_documents
-        ]
-        
-        return ListDocumentsResponse(
-            documents=document_items,
-            page=page,
-            limit=limit,
-        )
+    async def version(self) -> str:
+        """Current corpus version; read it before the page it validates."""
+        return await self.document_repository.corpus_version.get()
+
+    async def execute(self, page: int = 1, limit: int = 10) -> dict:
+        documents = await self.document_repository.get_page((page - 1) * limit, limit)
+        return self.render(documents, page, limit)
+
+    @staticmethod
+    def render(documents: List[Document], page: int, limit: int) -> dict:
+        return {
+            "documents": [ListDocumentsUseCase._to_item(doc) for doc in documents],
+            "page": page,
+            "limit": limit,
+        }
 
+    @staticmethod
+    def _to_item(doc: Document) -> dict:
+        item = {field: getattr(doc, field) for field in _ITEM_FIELDS}
+        # The datetime is left for orjson, which writes it exactly as
+        # isoformat() does, much faster
+        item["uploaded_at"] = item["uploaded_at"] or ""
+        return item
@@ -1,60 +1,88 @@
+import asyncio
 from datetime import datetime, timezone
-import os
+from typing import Optional
 import uuid
 
 from app.domain.dto.request import UploadDocumentRequest
 from app.domain.dto.response import UploadDocumentResponse
 from app.domain.entities import Document
+from app.infra.deadline import Deadline, RequestCancelled
+from app.infra.extractors import HEADER_BYTES, resolve_extractor
 from app.infra.gateway import GeminiGateway
+from app.infra.metrics import metrics
 from app.infra.repositories import DocumentRepository
+from app.infra.storage import BlobStore
 
 
 class SaveDocumentUseCase:
     def __init__(self,
         document_repository: DocumentRepository,
         gemini_gateway: GeminiGateway,
-        upload_dir: str = "uploaded_files"
+        blob_store: BlobStore,
         ):
         self.document_repository = document_repository
         self.gemini_gateway = gemini_gateway
-        self.upload_dir = upload_dir
-        os.makedirs(self.upload_dir, exist_ok=True)
+        self.blob_store = blob_store
 
-    async def execute(self, request: UploadDocumentRequest) -> UploadDocumentResponse:
+    async def execute(
+        self,
+        request: UploadDocumentRequest,
+        deadline: Optional[Deadline] = None,
+    ) -> UploadDocumentResponse:
+        deadline = deadline or Deadline()
         file = request.file
         description = request.description
 
-        doc_id = str(uuid.uuid4())
-        file_ext = os.path.splitext(file.filename or "")[1]
-        stored_filename = f"{doc_id}{file_ext}" if file_ext else doc_id
-        filepath = os.path.join(self.upload_dir, stored_filename)
+        # Reject unsupported types before anything is written to disk
+        header = await file.read(HEADER_BYTES)
+        await file.seek(0)
+        extractor = resolve_extractor(header, file.content_type, file.filename)
 
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-
-        file_bytes = await file.read()
-        with open(filepath, "wb") as buffer:
-            buffer.write(file_bytes)
-
-        size = os.path.getsize(filepath)
+        # Identical files share one stored blob
+        deadline.check("blob.put")
+        blob = await self.blob_store.put_upload(file)
 
         document = Document(
-            id=doc_id,
+            id=str(uuid.uuid4()),
             filename=file.filename,
-            filepath=filepath,
+            filepath=blob.path,
             uploaded_at=datetime.now(timezone.utc),
-            mimetype=file.content_type,
-            size=size,
+            mimetype=extractor.document_mimetype(file.content_type),
+            size=blob.size,
             description=description,
+            content_hash=blob.key,
         )
 
         # Save document to database using repository
-        saved_document = await self.document_repository.create(document)
+        try:
+            saved_document = await self.document_repository.create(document)
+        except Exception:
+            await self.blob_store.release(blob.key)
+            raise
 
-        # Index document using Gemini gateway
-        self.gemini_gateway.index_document(saved_document)
+        # Index document using Gemini gateway; embedding blocks, so it runs in
+        # a worker thread that stops at the next batch once the request is
+        # gone. Content that passed the header check can still fail to parse,
+        # so any failure undoes the upload rather than leaving it half-indexed.
+        try:
+            deadline.check("index")
+            await asyncio.to_thread(self.gemini_gateway.index_document, saved_document, deadline)
+        except RequestCancelled:
+            await self._discard(saved_document)
+            metrics.increment("cancelled.uploads_discarded")
+            raise
+        except Exception:
+            await self._discard(saved_document)
+            metrics.increment("index.uploads_discarded")
+            raise
 
         return UploadDocumentResponse(
             id=saved_document.id,
             filename=saved_document.filename,
             filepath=saved_document.filepath,
         )
+
+    async def _discard(self, document: Document):
+        """Undo an upload that was abandoned or failed while indexing."""
+        await asyncio.to_thread(self.gemini_gateway.delete_document, document.id)
+        await self.document_repository.delete(document.id, on_blob_unused=self.blob_store.remove_file)
@@ -0,0 +1,3 @@
+from .migrate_index import MigrateIndexUseCase, Throttle
+
+__all__ = ["MigrateIndexUseCase", "Throttle"]
@@ -0,0 +1,164 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from app.domain.dates import as_utc
+from app.domain.entities import Document
+from app.infra.gateway import (
+    GeminiGateway,
+    IndexMigration,
+    IndexMigrationError,
+    IndexSpec,
+    MigrationCheckpoint,
+)
+from app.infra.repositories import DocumentRepository
+
+
+def _order_key(document: Document) -> Tuple[datetime, str]:
+    return as_utc(document.uploaded_at), document.id
+
+
+class Throttle:
+    """Sleeps as needed to keep throughput under ``rate`` items per second."""
+
+    def __init__(self, rate: Optional[float] = None):
+        self.rate = rate
+        self.started = time.monotonic()
+        self.done = 0
+
+    def __call__(self, count: int):
+        self.done += count
+        if not self.rate:
+            return
+        ahead = self.done / self.rate - (time.monotonic() - self.started)
+        if ahead > 0:
+            time.sleep(ahead)
+
+
+class MigrateIndexUseCase:
+    """Re-embed the corpus into a new index version and switch to it.
+
+    The target collection is rebuilt document by document from the stored
+    blobs, oldest first, while uploads dual-write to it. A checkpoint is
+    recorded after each document so a paused, failed or killed run resumes
+    where it stopped. Queries are served from the active version until the
+    registry switches to the target once every document is written.
+    """
+
+    # A running migration not updated for this long is taken over on resume
+    STALE_AFTER = timedelta(minutes=5)
+
+    def __init__(self, document_repository: DocumentRepository, gemini_gateway: GeminiGateway):
+        self.document_repository = document_repository
+        self.gemini_gateway = gemini_gateway
+        self.registry = gemini_gateway.registry
+
+    def start(self, **changes) -> IndexMigration:
+        """Begin a migration to the active settings with ``changes`` applied."""
+        return self.registry.begin_migration(**changes)
+
+    def pause(self) -> IndexMigration:
+        """Ask the running job to stop after the current document."""
+        return self.registry.update_migration(status="paused")
+
+    def abort(self) -> IndexSpec:
+        """Abandon the migration and drop its partially built collection."""
+        target = self.registry.abort()
+        self.gemini_gateway.drop_index(target)
+        return target
+
+    def drop_retired(self) -> list:
+        """Drop the collections of index versions replaced by a migration."""
+        retired = self.registry.forget_retired()
+        for spec in retired:
+            self.gemini_gateway.drop_index(spec)
+        return [spec.version for spec in retired]
+
+    def status(self) -> dict:
+        return self.registry.state().model_dump(mode="json")
+
+    def claim(self) -> IndexMigration:
+        """Mark the migration as running; fails if a live job already runs it."""
+        return self.registry.claim_migration(self.STALE_AFTER)
+
+    async def execute(self, max_chunks_per_second: Optional[float] = None) -> dict:
+        """Run or resume the migration until it completes, pauses or is aborted."""
+        return await self.run(self.claim(), max_chunks_per_second)
+
+    async def run(self, migration: IndexMigration, max_chunks_per_second: Optional[float] = None) -> dict:
+        """Run a migration returned by ``claim``."""
+        target = migration.target
+        checkpoint = migration.checkpoint
+
+        throttle = Throttle(max_chunks_per_second)
+        started = time.perf_counter()
+        processed = chunks = 0
+        try:
+            documents = sorted(await self.document_repository.get_all(), key=_order_key)
+            if checkpoint.document_id is not None:
+                done = (checkpoint.uploaded_at, checkpoint.document_id)
+                documents = [doc for doc in documents if _order_key(doc) > done]
+            self.registry.update_migration(
+                version=target.version,
+                total_documents=checkpoint.documents_done + len(documents),
+            )
+
+            for document in documents:
+                current = self.registry.migration()
+                if current is None or current.target.version != target.version:
+                    return self._report("aborted", target, processed, chunks, started)
+                if current.status == "paused":
+                    return self._report("paused", target, processed, chunks, started)
+                if current.status == "failed":
+                    # A dual-write to the target failed; resume rebuilds from the checkpoint
+                    return self._report("failed", target, processed, chunks, started)
+                if current.run_id != migration.run_id:
+                    return self._report("superseded", target, processed, chunks, started)
+
+                # Skip documents deleted since the list was read; deletes also
+                # remove chunks from the target, so re-check after writing
+                if await self.document_repository.get_by_id(document.id) is None:
+                    continue
+                written = await asyncio.to_thread(
+                    self.gemini_gateway.reindex_document, document, target, throttle
+                )
+                if await self.document_repository.get_by_id(document.id) is None:
+                    self.gemini_gateway.store_for(target).delete(where={"document_id": document.id})
+                    continue
+
+                processed += 1
+                chunks += written
+                uploaded_at, document_id = _order_key(document)
+                self.registry.update_migration(
+                    version=target.version,
+                    checkpoint=MigrationCheckpoint(
+                        uploaded_at=uploaded_at,
+                        document_id=document_id,
+                        documents_done=checkpoint.documents_done + processed,
+                        chunks_done=checkpoint.chunks_done + chunks,
+                    ),
+                )
+            self.registry.activate(version=target.version)
+        except IndexMigrationError:
+            return self._report("aborted", target, processed, chunks, started)
+        except Exception as e:
+            current = self.registry.migration()
+            if current is None or current.target.version != target.version:
+                return self._report("aborted", target, processed, chunks, started)
+            self.registry.update_migration(version=target.version, status="failed", error=str(e))
+            raise
+
+        return self._report("completed", target, processed, chunks, started)
+
+    def _report(self, status: str, target: IndexSpec, documents: int, chunks: int, started: float) -> dict:
+        seconds = time.perf_counter() - started
+        return {
+            "status": status,
+            "version": target.version,
+            "collection": target.collection,
+            "documents_indexed": documents,
+            "chunks_indexed": chunks,
+            "seconds": seconds,
+            "chunks_per_second": chunks / seconds if seconds else 0.0,
+        }
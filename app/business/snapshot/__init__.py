@@ -0,0 +1,4 @@
+from .export_snapshot import ExportSnapshotUseCase
+from .import_snapshot import ImportSnapshotUseCase
+
+__all__ = ["ExportSnapshotUseCase", "ImportSnapshotUseCase"]
@@ -0,0 +1,74 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from app.domain.dates import as_utc
+from app.domain.entities import Document
+from app.infra.gateway import GeminiGateway
+from app.infra.repositories import DocumentRepository
+from app.infra.snapshot import DOCUMENT_IDS, DOCUMENTS, SnapshotWriter
+
+
+class ExportSnapshotUseCase:
+    """Export the vector index and documents table to a snapshot file."""
+
+    # Documents are indexed after their row is written, so an incremental
+    # export also re-sends documents uploaded shortly before ``since`` in
+    # case their chunks were still being written during the previous export.
+    # Re-sent chunks are upserted under the same ids, so overlap is harmless.
+    INCREMENTAL_OVERLAP = timedelta(minutes=15)
+
+    def __init__(self, document_repository: DocumentRepository, gemini_gateway: GeminiGateway):
+        self.document_repository = document_repository
+        self.gemini_gateway = gemini_gateway
+
+    async def execute(
+        self,
+        path: str,
+        since: Optional[datetime] = None,
+        base_snapshot_id: Optional[str] = None,
+    ) -> dict:
+        """Write a full snapshot, or only changes after ``since``."""
+        as_of = datetime.now(timezone.utc)
+        documents = await self.document_repository.get_all()
+        if since is None:
+            changed = documents
+        else:
+            cutoff = as_utc(since) - self.INCREMENTAL_OVERLAP
+            changed = [doc for doc in documents if as_utc(doc.uploaded_at) > cutoff]
+
+        return await asyncio.to_thread(
+            self._write, path, documents, changed, since, base_snapshot_id, as_of
+        )
+
+    def _write(
+        self,
+        path: str,
+        documents: List[Document],
+        changed: List[Document],
+        since: Optional[datetime],
+        base_snapshot_id: Optional[str],
+        as_of: datetime,
+    ) -> dict:
+        writer = SnapshotWriter(path)
+        try:
+            writer.write_jsonl(DOCUMENTS, (doc.to_dict() for doc in changed))
+            if since is not None:
+                writer.write_jsonl(DOCUMENT_IDS, ({"id": doc.id} for doc in documents))
+                chunks = self.gemini_gateway.iter_chunks([doc.id for doc in changed])
+            else:
+                chunks = self.gemini_gateway.iter_chunks()
+            writer.write_chunks(chunks)
+        except Exception:
+            writer.cleanup()
+            raise
+
+        return writer.finish(
+            snapshot_id=str(uuid.uuid4()),
+            kind="full" if since is None else "incremental",
+            base_snapshot_id=base_snapshot_id,
+            since=as_utc(since).isoformat() if since is not None else None,
+            as_of=as_of.isoformat(),
+            **self.gemini_gateway.index_metadata(),
+        )
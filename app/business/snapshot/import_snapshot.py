@@ -0,0 +1,152 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import List, Set, Tuple
+
+from app.domain.entities import Document
+from app.infra.gateway import GeminiGateway
+from app.infra.repositories import DocumentRepository
+from app.infra.storage import BlobStore
+from app.infra.snapshot import (
+    CHUNKS,
+    DOCUMENT_IDS,
+    DOCUMENTS,
+    SnapshotError,
+    SnapshotReader,
+    iter_chunks,
+    iter_jsonl,
+    read_manifest,
+)
+
+
+def document_from_dict(row: dict) -> Document:
+    return Document(
+        id=row["id"],
+        filename=row["filename"],
+        filepath=row["filepath"],
+        uploaded_at=datetime.fromisoformat(row["uploaded_at"]),
+        mimetype=row.get("mimetype"),
+        size=row.get("size"),
+        description=row.get("description"),
+        content_hash=row.get("content_hash"),
+    )
+
+
+class ImportSnapshotUseCase:
+    """Load a snapshot into the local index and documents table.
+
+    Chunks are written with their stored embeddings, so no embedding calls
+    are made. After import the node holds exactly the snapshot's documents:
+    local documents missing from a full snapshot, or from an incremental
+    snapshot's list of live ids, are removed.
+
+    Uploaded files are not part of a snapshot; replicas are expected to
+    share blob storage. Imported documents take references to their blobs
+    and removed ones release them, as uploads and deletes do.
+
+    An incremental snapshot only applies on top of the snapshot it was
+    exported against, so the id of each imported snapshot is recorded.
+    """
+
+    BATCH_SIZE = 5000
+
+    def __init__(
+        self,
+        document_repository: DocumentRepository,
+        gemini_gateway: GeminiGateway,
+        blob_store: BlobStore,
+    ):
+        self.document_repository = document_repository
+        self.gemini_gateway = gemini_gateway
+        self.blob_store = blob_store
+
+    async def execute(self, path: str, verify: bool = True) -> dict:
+        manifest = read_manifest(path)
+        self._check_compatible(manifest)
+        self._check_base(manifest)
+        reader = SnapshotReader(path)
+        timings = {}
+
+        started = time.perf_counter()
+        if verify:
+            await asyncio.to_thread(reader.verify)
+        timings["verify_seconds"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        manifest, documents, live_ids, chunk_count = await asyncio.to_thread(self._load, reader)
+        timings["chunks_seconds"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        blobs = {
+            doc.content_hash: self.blob_store.describe(doc.content_hash, doc.filepath, doc.size or 0)
+            for doc in documents if doc.content_hash
+        }
+        await self.document_repository.upsert_many(
+            documents, blobs=blobs, on_blob_unused=self.blob_store.remove_file
+        )
+        if manifest["kind"] == "full":
+            live_ids = {doc.id for doc in documents}
+        local_ids = {doc.id for doc in await self.document_repository.get_all()}
+        stale_ids = sorted(local_ids - live_ids)
+        for document_id in stale_ids:
+            self.gemini_gateway.delete_document(document_id)
+        await self.document_repository.delete_many(stale_ids, on_blob_unused=self.blob_store.remove_file)
+        self.gemini_gateway.registry.record_snapshot(manifest["snapshot_id"])
+        timings["documents_seconds"] = time.perf_counter() - started
+
+        return {
+            "snapshot_id": manifest["snapshot_id"],
+            "kind": manifest["kind"],
+            "as_of": manifest["as_of"],
+            "documents_imported": len(documents),
+            "chunks_imported": chunk_count,
+            "documents_removed": len(stale_ids),
+            **timings,
+        }
+
+    def _check_compatible(self, manifest: dict):
+        """Refuse snapshots embedded with another model or dimension."""
+        if self.gemini_gateway.registry.migration() is not None:
+            # Imported vectors could only reach the active index, not the target
+            raise SnapshotError("Cannot import a snapshot while an index migration is in progress")
+        local = self.gemini_gateway.index_metadata()
+        for key, value in local.items():
+            if manifest.get(key) is not None and value is not None and manifest[key] != value:
+                raise SnapshotError(
+                    f"Snapshot {key} is {manifest[key]}, local index uses {value}"
+                )
+
+    def _check_base(self, manifest: dict):
+        """Refuse incremental snapshots not built on the last one imported here."""
+        if manifest["kind"] != "incremental":
+            return
+        base = manifest.get("base_snapshot_id")
+        if base is None:
+            raise SnapshotError(
+                "Incremental snapshot has no base snapshot; export it against the "
+                "snapshot this node last imported"
+            )
+        imported = self.gemini_gateway.registry.active().snapshot_id
+        if base != imported:
+            raise SnapshotError(
+                f"Incremental snapshot builds on {base}, but this node last imported "
+                f"{imported or 'no snapshot'}"
+            )
+
+    def _load(self, reader: SnapshotReader) -> Tuple[dict, List[Document], Set[str], int]:
+        manifest = None
+        documents: List[Document] = []
+        live_ids: Set[str] = set()
+        chunk_count = 0
+        for manifest, name, member in reader.members():
+            if name == DOCUMENTS:
+                for rows in iter_jsonl(member, self.BATCH_SIZE):
+                    documents.extend(document_from_dict(row) for row in rows)
+            elif name == DOCUMENT_IDS:
+                for rows in iter_jsonl(member, self.BATCH_SIZE):
+                    live_ids.update(row["id"] for row in rows)
+            elif name == CHUNKS and manifest["dimension"]:
+                for batch in iter_chunks(member, manifest["dimension"], self.BATCH_SIZE):
+                    self.gemini_gateway.upsert_chunks(**batch)
+                    chunk_count += len(batch["ids"])
+        return manifest, documents, live_ids, chunk_count
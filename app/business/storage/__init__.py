@@ -0,0 +1,3 @@
+from .migrate_blobs import MigrateBlobsUseCase
+
+__all__ = ["MigrateBlobsUseCase"]
@@ -0,0 +1,46 @@
+import os
+
+from app.infra.repositories import DocumentRepository
+from app.infra.storage import BlobStore
+
+
+class MigrateBlobsUseCase:
+    """Move files uploaded before blob storage into the blob store."""
+
+    def __init__(self, document_repository: DocumentRepository, blob_store: BlobStore):
+        self.document_repository = document_repository
+        self.blob_store = blob_store
+
+    async def execute(self, dry_run: bool = False) -> dict:
+        documents = await self.document_repository.get_all()
+        legacy = [doc for doc in documents if not doc.content_hash]
+
+        migrated = 0
+        missing = []
+        legacy_bytes = 0
+        for document in legacy:
+            if not os.path.exists(document.filepath):
+                missing.append(document.id)
+                continue
+            legacy_bytes += os.path.getsize(document.filepath)
+            if dry_run:
+                continue
+
+            old_path = document.filepath
+            blob = await self.blob_store.put_file(old_path)
+            document.filepath = blob.path
+            document.content_hash = blob.key
+            document.size = blob.size
+            await self.document_repository.update(document)
+            # Only drop the original once the document points at its blob
+            os.remove(old_path)
+            migrated += 1
+
+        return {
+            "dry_run": dry_run,
+            "legacy_documents": len(legacy),
+            "migrated_documents": migrated,
+            "missing_files": missing,
+            "legacy_bytes": legacy_bytes,
+            "storage": await self.blob_store.stats(),
+        }
@@ -1,4 +1,7 @@
+from typing import Optional
+
 from app.domain.dto.response.retrieve_info import RetrieveInfoResponse
+from app.infra.deadline import Deadline
 from app.infra.gateway import GeminiGateway
 
 
@@ -6,8 +9,8 @@ class RetrieveInfoUseCase:
     def __init__(self, gemini_gateway: GeminiGateway):
         self.gemini_gateway = gemini_gateway
 
-    async def execute(self, message: str):
+    async def execute(self, message: str, deadline: Optional[Deadline] = None):
         # Use the gateway's async generator method and wrap the result
-        response_text = await self.gemini_gateway.generate_response(message)
+        response_text = await self.gemini_gateway.generate_response(message, deadline)
         return RetrieveInfoResponse(message=message, response=response_text)
 
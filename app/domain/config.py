@@ -1,13 +1,16 @@
 # Configuration for loading .env files
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Literal, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 # Get the project root directory (parent of 'app' directory)
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 ENV_FILE = PROJECT_ROOT / ".env"
 
+# Largest embedding output of the Gemini models
+MAX_EMBEDDING_DIMENSION = 3072
+
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables and .env file."""
@@ -15,6 +18,39 @@ class Settings(BaseSettings):
 
     google_api_key: str
 
+    # Embeddings. Reduced dimensions are either requested from the API or
+    # produced locally by truncating full-size vectors; both are re-normalized.
+    # These and the chunking settings describe the first index version; an
+    # existing index is moved to new settings with `manage.py reindex`.
+    EMBEDDING_MODEL: str = "gemini-embedding-001"
+    EMBEDDING_DIMENSION: int = 3072
+    EMBEDDING_DIMENSION_MODE: Literal["api", "truncate"] = "api"
+
+    # Chunking of extracted text before embedding
+    CHUNK_SIZE: int = 2000
+    CHUNK_OVERLAP: int = 200
+
+    # Content-addressed storage for uploaded files
+    BLOB_STORAGE_DIR: str = "uploaded_files"
+    BLOB_COMPRESSION: bool = True
+    BLOB_COMPRESSION_LEVEL: int = 3
+
+    # Seconds /documents/talk and /documents/upload may run before they are
+    # abandoned; clients can ask for their own limit with X-Request-Timeout,
+    # up to REQUEST_TIMEOUT_MAX. Unset to disable the default deadline.
+    REQUEST_TIMEOUT: Optional[float] = 120.0
+    REQUEST_TIMEOUT_MAX: float = 600.0
+
+    # Read endpoints: rendered pages kept in memory per corpus version (0
+    # disables), and the max-age clients may reuse a response without
+    # revalidating its ETag (0 sends no-cache)
+    RESPONSE_CACHE_SIZE: int = 256
+    CACHE_MAX_AGE: int = 0
+
+    # Required in the X-Admin-Token header for /admin endpoints, which are
+    # disabled while it is unset
+    ADMIN_TOKEN: Optional[str] = None
+
     model_config = SettingsConfigDict(
         env_file=str(ENV_FILE) if ENV_FILE.exists() else None,
         env_file_encoding="utf-8",
@@ -0,0 +1,9 @@
+from datetime import datetime, timezone
+
+
+def as_utc(value: datetime) -> datetime:
+    """Return ``value`` as an aware UTC datetime.
+
+    SQLite hands back naive datetimes; they are stored in UTC.
+    """
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
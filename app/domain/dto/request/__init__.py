@@ -1,7 +1,8 @@
 """Request DTOs package."""
 
+from .migrate_index import MigrateIndexRequest
 from .retrieve_info import RetrieveInfoRequest
 from .upload_document import UploadDocumentRequest
 
-__all__ = ["RetrieveInfoRequest", "UploadDocumentRequest"]
+__all__ = ["MigrateIndexRequest", "RetrieveInfoRequest", "UploadDocumentRequest"]
 
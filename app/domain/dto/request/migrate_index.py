@@ -0,0 +1,22 @@
+from typing import Literal, Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+from app.domain.config import MAX_EMBEDDING_DIMENSION
+
+
+class MigrateIndexRequest(BaseModel):
+    """Settings for the next index version; unset fields keep the active ones."""
+    embedding_model: Optional[str] = None
+    embedding_dimension: Optional[int] = Field(None, gt=0, le=MAX_EMBEDDING_DIMENSION)
+    dimension_mode: Optional[Literal["api", "truncate"]] = None
+    chunk_size: Optional[int] = Field(None, gt=0)
+    chunk_overlap: Optional[int] = Field(None, ge=0)
+    max_chunks_per_second: Optional[float] = Field(None, gt=0)
+
+    @model_validator(mode="after")
+    def _check_overlap(self) -> "MigrateIndexRequest":
+        # Combinations with inherited values are checked when the migration starts
+        if self.chunk_size is not None and self.chunk_overlap is not None and self.chunk_overlap >= self.chunk_size:
+            raise ValueError("chunk_overlap must be smaller than chunk_size")
+        return self
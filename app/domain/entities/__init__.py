@@ -1,4 +1,4 @@
+from .blob import Blob
 from .document import Document
 
-__all__ = ["Document"]
-
+__all__ = ["Blob", "Document"]
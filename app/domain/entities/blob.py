@@ -0,0 +1,21 @@
+from datetime import datetime
+from typing import Optional
+
+class Blob:
+    def __init__(
+        self,
+        key: str,
+        path: str,
+        size: int,
+        stored_size: int,
+        compressed: bool,
+        refcount: int,
+        created_at: Optional[datetime] = None
+    ):
+        self.key = key
+        self.path = path
+        self.size = size
+        self.stored_size = stored_size
+        self.compressed = compressed
+        self.refcount = refcount
+        self.created_at = created_at
@@ -10,7 +10,8 @@ class Document:
         uploaded_at: datetime,
         mimetype: Optional[str] = None,
         size: Optional[int] = None,
-        description: Optional[str] = None
+        description: Optional[str] = None,
+        content_hash: Optional[str] = None
     ):
         self.id = id
         self.filename = filename
@@ -19,6 +20,7 @@ class Document:
         self.mimetype = mimetype
         self.size = size
         self.description = description
+        self.content_hash = content_hash
 
     def to_dict(self):
         return {
@@ -29,5 +31,6 @@ class Document:
             "mimetype": self.mimetype,
             "size": self.size,
             "description": self.description,
+            "content_hash": self.content_hash,
         }
 
@@ -0,0 +1,139 @@
+# Per-request deadlines and cancellation.
+#
+# A Deadline travels with one request's work. It expires after the request
+# timeout and is cancelled when the client disconnects; the pipeline checks
+# it between stages and batches, including from worker threads, and stops
+# instead of finishing work nobody will read.
+
+import asyncio
+import time
+from typing import AsyncIterator, Awaitable, Optional, TypeVar
+
+from fastapi import Header, Request
+
+from app.domain.config import settings
+from app.infra.metrics import metrics
+
+T = TypeVar("T")
+
+
+class RequestCancelled(Exception):
+    """Raised when a request's work is abandoned."""
+
+    reason = "cancelled"
+
+
+class DeadlineExceeded(RequestCancelled):
+    """Raised when a request runs past its deadline."""
+
+    reason = "deadline"
+
+
+class ClientDisconnected(RequestCancelled):
+    """Raised when the client went away before the response was ready."""
+
+    reason = "disconnected"
+
+
+class Deadline:
+    """Time budget and cancellation flag for one request."""
+
+    def __init__(self, timeout: Optional[float] = None):
+        self.timeout = timeout
+        self.expires_at = time.monotonic() + timeout if timeout else None
+        self.disconnected = False
+        # Reason of the first RequestCancelled raised, if any
+        self.tripped: Optional[str] = None
+        self._event = asyncio.Event()
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left, or None without a time limit."""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+    def cancel(self):
+        """Mark the client as gone; must be called from the event loop."""
+        self.disconnected = True
+        self._event.set()
+
+    def check(self, stage: str):
+        """Raise if the request was cancelled or ran out of time.
+
+        ``stage`` is the work about to start and is counted as skipped.
+        """
+        if self.disconnected:
+            raise self._trip(ClientDisconnected(f"Client disconnected before {stage}"), stage)
+        if self.expired():
+            raise self._trip(DeadlineExceeded(f"Deadline of {self.timeout}s exceeded before {stage}"), stage)
+
+    async def wait(self, awaitable: Awaitable[T], stage: str) -> T:
+        """Await ``awaitable``, abandoning it on cancellation or expiry."""
+        self.check(stage)
+        task = asyncio.ensure_future(awaitable)
+        cancelled = asyncio.ensure_future(self._event.wait())
+        try:
+            await asyncio.wait(
+                {task, cancelled},
+                timeout=self.remaining(),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        finally:
+            cancelled.cancel()
+        if task.done():
+            return task.result()
+
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        if self.disconnected:
+            raise self._trip(ClientDisconnected(f"Client disconnected during {stage}"), stage)
+        raise self._trip(DeadlineExceeded(f"Deadline of {self.timeout}s exceeded during {stage}"), stage)
+
+    def _trip(self, error: RequestCancelled, stage: str) -> RequestCancelled:
+        if self.tripped is None:
+            self.tripped = error.reason
+        metrics.increment(f"cancelled.{stage}")
+        return error
+
+
+async def _watch_disconnect(request: Request, deadline: Deadline):
+    # Reads the raw ASGI messages, so it must only run once the body has been
+    # consumed; the next message is then the disconnect
+    while True:
+        message = await request.receive()
+        if message["type"] == "http.disconnect":
+            deadline.cancel()
+            return
+
+
+async def get_deadline(
+    request: Request,
+    x_request_timeout: Optional[float] = Header(None, gt=0),
+) -> AsyncIterator[Deadline]:
+    """Dependency giving the request a deadline that also trips on disconnect.
+
+    Clients may set their own timeout in seconds with X-Request-Timeout, up
+    to REQUEST_TIMEOUT_MAX.
+
+    The disconnect watcher receives ASGI messages itself, so the request body
+    must already be read when it starts. FastAPI reads JSON and form bodies
+    before it resolves dependencies, which covers every route using this
+    one; a route that streams its body with ``request.stream()`` must not.
+    """
+    timeout = settings.REQUEST_TIMEOUT
+    if x_request_timeout is not None:
+        timeout = min(x_request_timeout, settings.REQUEST_TIMEOUT_MAX)
+    deadline = Deadline(timeout)
+    watcher = asyncio.create_task(_watch_disconnect(request, deadline))
+    try:
+        yield deadline
+    finally:
+        watcher.cancel()
+        if deadline.tripped is not None:
+            metrics.increment(f"requests.cancelled.{deadline.tripped}")
@@ -0,0 +1,36 @@
+"""Text extractors for uploaded documents, dispatched by file type."""
+
+from app.infra.extractors.base import (
+    HEADER_BYTES,
+    Extractor,
+    Section,
+    UnsupportedDocumentTypeError,
+    declared_charset,
+    get_extractor,
+    register_extractor,
+    resolve_extractor,
+    supported_mimetypes,
+)
+from app.infra.extractors.docx import DocxExtractor
+from app.infra.extractors.html import HtmlExtractor
+from app.infra.extractors.markdown import MarkdownExtractor
+from app.infra.extractors.pdf import PdfExtractor
+from app.infra.extractors.text import TextExtractor
+
+register_extractor(PdfExtractor())
+register_extractor(DocxExtractor())
+register_extractor(HtmlExtractor())
+register_extractor(MarkdownExtractor())
+register_extractor(TextExtractor())
+
+__all__ = [
+    "HEADER_BYTES",
+    "Extractor",
+    "Section",
+    "UnsupportedDocumentTypeError",
+    "declared_charset",
+    "get_extractor",
+    "register_extractor",
+    "resolve_extractor",
+    "supported_mimetypes",
+]
@@ -0,0 +1,194 @@
+import abc
+import codecs
+import io
+import os
+import shutil
+import tempfile
+from typing import BinaryIO, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import filetype
+
+# Number of leading bytes inspected for magic-byte detection (filetype's own limit)
+HEADER_BYTES = 8192
+
+# Upper bound for a single yielded section of formats without natural pages
+SECTION_CHARS = 16_000
+
+# Non-seekable streams are spooled to memory up to this size, then to disk
+SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
+
+class UnsupportedDocumentTypeError(ValueError):
+    """Raised when no extractor can handle a file."""
+
+
+class Section(NamedTuple):
+    """A page or section of extracted text with its chunk metadata."""
+    text: str
+    metadata: Dict[str, object]
+
+
+class Extractor(abc.ABC):
+    """Base class for format extractors.
+
+    Subclasses yield text page by page or section by section so a document is
+    never materialized in memory as a whole.
+    """
+
+    name: str = ""
+    # Canonical mimetype stored for documents handled by this extractor
+    mimetype: str = ""
+    # Declared mimetypes and file extensions accepted for this format
+    mimetypes: Tuple[str, ...] = ()
+    extensions: Tuple[str, ...] = ()
+    # Binary formats must be confirmed by their magic bytes
+    binary: bool = False
+    # Generic containers filetype may report instead of the specific format
+    container_mimetypes: Tuple[str, ...] = ()
+
+    @abc.abstractmethod
+    def extract(self, stream: BinaryIO, charset: Optional[str] = None) -> Iterator[Section]:
+        """Yield the sections of the document in ``stream``.
+
+        ``charset`` is the encoding declared with the upload, if any; binary
+        formats ignore it.
+        """
+
+    def document_mimetype(self, declared: Optional[str] = None) -> str:
+        """Mimetype stored for a document, keeping a declared charset for text formats."""
+        charset = None if self.binary else declared_charset(declared)
+        return f"{self.mimetype}; charset={charset}" if charset else self.mimetype
+
+
+_extractors: List[Extractor] = []
+_by_mimetype: Dict[str, Extractor] = {}
+_by_extension: Dict[str, Extractor] = {}
+
+
+def register_extractor(extractor: Extractor) -> Extractor:
+    """Register an extractor for its mimetypes and extensions."""
+    _extractors.append(extractor)
+    for mimetype in (extractor.mimetype, *extractor.mimetypes):
+        _by_mimetype[mimetype] = extractor
+    for extension in extractor.extensions:
+        _by_extension[extension] = extractor
+    return extractor
+
+
+def supported_mimetypes() -> List[str]:
+    """Return the canonical mimetypes of all registered extractors."""
+    return [extractor.mimetype for extractor in _extractors]
+
+
+def _normalize_mimetype(mimetype: Optional[str]) -> str:
+    return (mimetype or "").split(";", 1)[0].strip().lower()
+
+
+def declared_charset(mimetype: Optional[str]) -> Optional[str]:
+    """Return the codec named by the ``charset`` parameter of ``mimetype``.
+
+    Unknown or missing charsets give ``None`` so callers fall back to their
+    own detection.
+    """
+    for parameter in (mimetype or "").split(";")[1:]:
+        key, _, value = parameter.partition("=")
+        if key.strip().lower() == "charset":
+            try:
+                return codecs.lookup(value.strip().strip("\"'")).name
+            except LookupError:
+                return None
+    return None
+
+
+def resolve_extractor(
+    header: bytes,
+    mimetype: Optional[str] = None,
+    filename: Optional[str] = None,
+) -> Extractor:
+    """Pick an extractor from the file's magic bytes, mimetype or extension.
+
+    Magic bytes win over whatever the client declared, so e.g. an image
+    uploaded as ``text/plain`` is rejected instead of indexed as garbage.
+    """
+    declared = _normalize_mimetype(mimetype)
+    extension = os.path.splitext(filename or "")[1].lower()
+    candidate = _by_mimetype.get(declared) or _by_extension.get(extension)
+
+    kind = filetype.guess(header) if header else None
+    if kind is not None:
+        extractor = _by_mimetype.get(kind.mime)
+        if extractor is not None:
+            return extractor
+        if candidate is not None and kind.mime in candidate.container_mimetypes:
+            return candidate
+        raise UnsupportedDocumentTypeError(f"Unsupported file type: {kind.mime}")
+
+    if b"\x00" in header:
+        raise UnsupportedDocumentTypeError("Unsupported binary file")
+    if candidate is None or candidate.binary:
+        raise UnsupportedDocumentTypeError(
+            f"Unsupported file type: {declared or extension or 'unknown'}"
+        )
+    return candidate
+
+
+class _PrefixedStream(io.RawIOBase):
+    """Replay already-consumed header bytes ahead of a forward-only stream."""
+
+    def __init__(self, prefix: bytes, stream: BinaryIO):
+        self._prefix = prefix
+        self._stream = stream
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._prefix:
+            count = min(len(buffer), len(self._prefix))
+            buffer[:count] = self._prefix[:count]
+            self._prefix = self._prefix[count:]
+            return count
+        data = self._stream.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def get_extractor(
+    stream: BinaryIO,
+    mimetype: Optional[str] = None,
+    filename: Optional[str] = None,
+) -> Tuple[Extractor, BinaryIO]:
+    """Resolve the extractor for an open stream.
+
+    Returns the extractor together with a stream positioned at the start of
+    the file. Forward-only streams, such as decompressing readers, are
+    wrapped so the sniffed header is not lost.
+    """
+    header = stream.read(HEADER_BYTES)
+    if stream.seekable():
+        stream.seek(0)
+    else:
+        stream = io.BufferedReader(_PrefixedStream(header, stream))
+    return resolve_extractor(header, mimetype, filename), stream
+
+
+def ensure_seekable(stream: BinaryIO) -> BinaryIO:
+    """Return a seekable view of ``stream``, spooling it if necessary."""
+    if stream.seekable():
+        return stream
+    spooled = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    shutil.copyfileobj(stream, spooled)
+    spooled.seek(0)
+    return spooled
+
+
+def split_long_text(text: str, limit: int = SECTION_CHARS) -> Iterator[str]:
+    """Cut ``text`` into pieces of at most ``limit`` characters on line breaks."""
+    while len(text) > limit:
+        cut = text.rfind("\n", 0, limit)
+        if cut <= 0:
+            cut = limit
+        yield text[:cut]
+        text = text[cut:].lstrip("\n")
+    if text:
+        yield text
@@ -0,0 +1,93 @@
+import zipfile
+from typing import BinaryIO, Iterator, List, Optional
+from xml.etree import ElementTree
+
+from app.infra.extractors.base import (
+    SECTION_CHARS,
+    Extractor,
+    Section,
+    UnsupportedDocumentTypeError,
+    ensure_seekable,
+)
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_PARAGRAPH = f"{_W}p"
+_TEXT = f"{_W}t"
+_TAB = f"{_W}tab"
+_BREAKS = {f"{_W}br", f"{_W}cr"}
+_STYLE = f"{_W}pStyle"
+_VAL = f"{_W}val"
+
+
+class DocxExtractor(Extractor):
+    """Extract text from Word documents one heading section at a time.
+
+    Reads ``word/document.xml`` straight from the zip container with an
+    incremental XML parser instead of loading a full document model.
+    """
+
+    name = "docx"
+    mimetype = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+    extensions = (".docx",)
+    binary = True
+    container_mimetypes = ("application/zip",)
+
+    def extract(self, stream: BinaryIO, charset: Optional[str] = None) -> Iterator[Section]:
+        try:
+            archive = zipfile.ZipFile(ensure_seekable(stream))
+            body = archive.open("word/document.xml")
+        except (zipfile.BadZipFile, KeyError) as e:
+            raise UnsupportedDocumentTypeError("Not a valid DOCX file") from e
+
+        section = 0
+        heading: Optional[str] = None
+        paragraphs: List[str] = []
+        length = 0
+        with archive, body:
+            for _, element in ElementTree.iterparse(body, events=("end",)):
+                if element.tag != _PARAGRAPH:
+                    continue
+                text = self._paragraph_text(element)
+                is_heading = self._is_heading(element)
+                element.clear()
+
+                if (is_heading or length >= SECTION_CHARS) and paragraphs:
+                    yield Section("\n".join(paragraphs), self._metadata(section, heading))
+                    section += 1
+                    paragraphs = []
+                    length = 0
+                if is_heading:
+                    heading = text.strip() or None
+                if text.strip():
+                    paragraphs.append(text)
+                    length += len(text)
+
+        if paragraphs:
+            yield Section("\n".join(paragraphs), self._metadata(section, heading))
+
+    @staticmethod
+    def _paragraph_text(paragraph) -> str:
+        parts = []
+        for node in paragraph.iter():
+            if node.tag == _TEXT:
+                parts.append(node.text or "")
+            elif node.tag == _TAB:
+                parts.append("\t")
+            elif node.tag in _BREAKS:
+                parts.append("\n")
+        return "".join(parts)
+
+    @staticmethod
+    def _is_heading(paragraph) -> bool:
+        style = paragraph.find(f"{_W}pPr/{_STYLE}")
+        if style is None:
+            return False
+        value = (style.get(_VAL) or "").lower()
+        return value.startswith("heading") or value == "title"
+
+    @staticmethod
+    def _metadata(section: int, heading: Optional[str]) -> dict:
+        metadata = {"section": section}
+        if heading:
+            metadata["heading"] = heading
+        return metadata
@@ -0,0 +1,143 @@
+import codecs
+import re
+from html.parser import HTMLParser
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+from app.infra.extractors.base import SECTION_CHARS, Extractor, Section
+
+READ_SIZE = 64 * 1024
+
+# Leading bytes searched for a <meta> charset declaration, as in the HTML prescan
+PRESCAN_BYTES = 1024
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+# Matches both <meta charset="..."> and <meta http-equiv content="...; charset=...">
+_META_CHARSET = re.compile(rb"<meta\b[^>]*?charset\s*=\s*[\"']?\s*([\w.:-]+)", re.IGNORECASE)
+
+_SKIPPED_TAGS = {"script", "style", "noscript", "template", "head"}
+_HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+_BLOCK_TAGS = _HEADING_TAGS | {
+    "p", "div", "br", "li", "tr", "section", "article", "header", "footer",
+    "blockquote", "pre", "table", "ul", "ol", "dt", "dd", "hr",
+}
+
+
+class _SectionParser(HTMLParser):
+    """Collect visible text, starting a new section at each heading."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.completed: List[Tuple[str, Optional[str]]] = []
+        self._parts: List[str] = []
+        self._length = 0
+        self._skip_depth = 0
+        self._heading: Optional[str] = None
+        self._heading_parts: Optional[List[str]] = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag in _HEADING_TAGS:
+            self.close_section()
+            self._heading_parts = []
+        if tag in _BLOCK_TAGS:
+            self._append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in _HEADING_TAGS and self._heading_parts is not None:
+            self._heading = " ".join("".join(self._heading_parts).split()) or None
+            self._heading_parts = None
+        if tag in _BLOCK_TAGS:
+            self._append("\n")
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        if self._heading_parts is not None:
+            self._heading_parts.append(data)
+        self._append(data)
+        if self._length >= SECTION_CHARS:
+            self.close_section()
+
+    def _append(self, text: str):
+        self._parts.append(text)
+        self._length += len(text)
+
+    def close_section(self):
+        text = "\n".join(
+            " ".join(line.split()) for line in "".join(self._parts).splitlines()
+        )
+        text = "\n".join(line for line in text.split("\n") if line)
+        if text:
+            self.completed.append((text, self._heading))
+        self._parts = []
+        self._length = 0
+
+
+def _html_encoding(label: str) -> Optional[str]:
+    try:
+        name = codecs.lookup(label).name
+    except LookupError:
+        return None
+    # Browsers decode these labels as windows-1252 and a <meta> can only
+    # be read in an ASCII-compatible encoding, so UTF-16 there means UTF-8
+    if name in ("iso8859-1", "ascii"):
+        return "cp1252"
+    if name.startswith("utf-16"):
+        return "utf-8"
+    return name
+
+
+def detect_charset(head: bytes, declared: Optional[str] = None) -> str:
+    """Pick the encoding of an HTML document from its leading bytes.
+
+    A byte order mark wins, then the charset declared with the upload, then
+    the first ``<meta>`` declaration in the first ``PRESCAN_BYTES``; UTF-8
+    otherwise.
+    """
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding
+    if declared:
+        return _html_encoding(declared) or "utf-8"
+    match = _META_CHARSET.search(head[:PRESCAN_BYTES])
+    if match:
+        return _html_encoding(match.group(1).decode("ascii")) or "utf-8"
+    return "utf-8"
+
+
+class HtmlExtractor(Extractor):
+    """Extract visible text from HTML files one heading section at a time."""
+
+    name = "html"
+    mimetype = "text/html"
+    mimetypes = ("application/xhtml+xml",)
+    extensions = (".html", ".htm", ".xhtml")
+
+    def extract(self, stream: BinaryIO, charset: Optional[str] = None) -> Iterator[Section]:
+        data = stream.read(READ_SIZE)
+        encoding = detect_charset(data, charset)
+        decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        parser = _SectionParser()
+        section = 0
+        while True:
+            parser.feed(decoder.decode(data, final=not data))
+            if not data:
+                parser.close()
+                parser.close_section()
+            for text, heading in parser.completed:
+                metadata = {"section": section}
+                if heading:
+                    metadata["heading"] = heading
+                yield Section(text, metadata)
+                section += 1
+            parser.completed.clear()
+            if not data:
+                break
+            data = stream.read(READ_SIZE)
@@ -0,0 +1,66 @@
+import io
+import re
+from typing import BinaryIO, Iterator, List, Optional
+
+from app.infra.extractors.base import SECTION_CHARS, Extractor, Section, split_long_text
+
+_HEADING = re.compile(r"^ {0,3}(#{1,6})[ \t]+(.*?)[ \t#]*$")
+_FENCE = re.compile(r"^ {0,3}(```|~~~)")
+
+
+class MarkdownExtractor(Extractor):
+    """Extract Markdown files one heading section at a time."""
+
+    name = "markdown"
+    mimetype = "text/markdown"
+    mimetypes = ("text/x-markdown",)
+    extensions = (".md", ".markdown")
+
+    def extract(self, stream: BinaryIO, charset: Optional[str] = None) -> Iterator[Section]:
+        reader = io.TextIOWrapper(stream, encoding=charset or "utf-8", errors="replace", newline="")
+        section = 0
+        heading: Optional[str] = None
+        lines: List[str] = []
+        length = 0
+        fence: Optional[str] = None
+        try:
+            for line in reader:
+                fence_match = _FENCE.match(line)
+                if fence_match:
+                    marker = fence_match.group(1)
+                    if fence is None:
+                        fence = marker
+                    elif fence == marker:
+                        fence = None
+
+                heading_match = _HEADING.match(line) if fence is None else None
+                if heading_match or length >= SECTION_CHARS:
+                    for text in self._flush(lines):
+                        yield Section(text, self._metadata(section, heading))
+                        section += 1
+                    lines = []
+                    length = 0
+                    if heading_match:
+                        heading = heading_match.group(2).strip() or None
+
+                lines.append(line)
+                length += len(line)
+
+            for text in self._flush(lines):
+                yield Section(text, self._metadata(section, heading))
+                section += 1
+        finally:
+            reader.detach()
+
+    @staticmethod
+    def _flush(lines: List[str]) -> Iterator[str]:
+        text = "".join(lines)
+        if text.strip():
+            yield from split_long_text(text)
+
+    @staticmethod
+    def _metadata(section: int, heading: Optional[str]) -> dict:
+        metadata = {"section": section}
+        if heading:
+            metadata["heading"] = heading
+        return metadata
@@ -0,0 +1,23 @@
+from typing import BinaryIO, Iterator, Optional
+
+from pypdf import PdfReader
+
+from app.infra.extractors.base import Extractor, Section, ensure_seekable
+
+
+class PdfExtractor(Extractor):
+    """Extract text from PDF files one page at a time."""
+
+    name = "pdf"
+    mimetype = "application/pdf"
+    mimetypes = ("application/x-pdf",)
+    extensions = (".pdf",)
+    binary = True
+
+    def extract(self, stream: BinaryIO, charset: Optional[str] = None) -> Iterator[Section]:
+        # PdfReader parses pages lazily, so only the current page is held in memory
+        reader = PdfReader(ensure_seekable(stream))
+        for page_number, page in enumerate(reader.pages):
+            text = page.extract_text() or ""
+            if text.strip():
+                yield Section(text, {"page": page_number})
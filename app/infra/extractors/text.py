@@ -0,0 +1,32 @@
+import io
+from typing import BinaryIO, Iterator, Optional
+
+from app.infra.extractors.base import SECTION_CHARS, Extractor, Section
+
+
+class TextExtractor(Extractor):
+    """Extract plain text files in sections of bounded size."""
+
+    name = "text"
+    mimetype = "text/plain"
+    extensions = (".txt", ".text", ".log")
+
+    def extract(self, stream: BinaryIO, charset: Optional[str] = None) -> Iterator[Section]:
+        reader = io.TextIOWrapper(stream, encoding=charset or "utf-8", errors="replace", newline="")
+        section = 0
+        lines = []
+        length = 0
+        try:
+            for line in reader:
+                lines.append(line)
+                length += len(line)
+                if length >= SECTION_CHARS:
+                    yield Section("".join(lines), {"section": section})
+                    section += 1
+                    lines = []
+                    length = 0
+            if lines:
+                yield Section("".join(lines), {"section": section})
+        finally:
+            # Leave the caller's stream open, the wrapper only borrowed it
+            reader.detach()
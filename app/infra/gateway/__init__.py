@@ -1,3 +1,27 @@
-from app.infra.gateway.gemini import GeminiGateway
+from app.infra.gateway.gemini import (
+    EmbeddingMismatchError,
+    GeminiGateway,
+    get_gemini_gateway,
+    normalize_embeddings,
+    open_vector_store,
+)
+from app.infra.gateway.index_registry import (
+    IndexMigration,
+    IndexMigrationError,
+    IndexRegistry,
+    IndexSpec,
+    MigrationCheckpoint,
+)
 
-__all__ = ["GeminiGateway"]
+__all__ = [
+    "EmbeddingMismatchError",
+    "GeminiGateway",
+    "IndexMigration",
+    "IndexMigrationError",
+    "IndexRegistry",
+    "IndexSpec",
+    "MigrationCheckpoint",
+    "get_gemini_gateway",
+    "normalize_embeddings",
+    "open_vector_store",
+]
@@ -1,33 +1,71 @@
+import asyncio
 import os
-from typing import Optional, List
+import threading
+from typing import Callable, Dict, Iterator, Optional, List, Tuple
 import google.generativeai as genai
+import numpy as np
 from langchain_chroma import Chroma
-from langchain_community.document_loaders import PyPDFLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
+from langchain_core.documents import Document as ChunkDocument
 from langchain_core.embeddings import Embeddings
 from langchain.agents.middleware import dynamic_prompt, ModelRequest
 
 from app.domain.config import settings
 from app.domain.entities import Document
+from app.infra.deadline import Deadline, RequestCancelled
+from app.infra.extractors import declared_charset, get_extractor
+from app.infra.gateway.index_registry import IndexMigrationError, IndexRegistry, IndexSpec
+from app.infra.metrics import metrics
+from app.infra.storage import open_blob
+
+
+class EmbeddingMismatchError(RuntimeError):
+    """Raised when a collection holds vectors from another model or dimension."""
+
+
+def normalize_embeddings(vectors, dimension: Optional[int] = None) -> List[List[float]]:
+    """Truncate vectors to ``dimension`` if given and L2-normalize them.
+
+    Gemini only normalizes full-size embeddings; reduced ones must be
+    re-normalized for cosine and dot-product search to stay meaningful.
+    """
+    array = np.asarray(vectors, dtype=np.float32)
+    if dimension:
+        array = array[..., :dimension]
+    norms = np.linalg.norm(array, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (array / norms).tolist()
 
 
 class GoogleGenerativeAIEmbeddings(Embeddings):
-    """Custom embeddings class using Google Generative AI SDK directly."""
+    """Custom embeddings class using Google Generative AI SDK directly.
+
+    With ``truncate`` the API returns full-size vectors that are cut to
+    ``dimension`` locally; otherwise the API is asked for ``dimension``.
+    """
     
-    def __init__(self, model: str = "gemini-embedding-001"):
+    def __init__(self, model: str = "gemini-embedding-001", dimension: int = 3072, truncate: bool = False):
         self.model_name = model
+        self.dimension = dimension
+        self.truncate = truncate
         genai.configure(api_key=settings.google_api_key)
+
+    @property
+    def _output_dimensionality(self) -> Optional[int]:
+        return None if self.truncate else self.dimension
     
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
         """Generate embeddings for a list of documents."""
         embeddings = []
         # Process each text individually
         for text in texts:
-            result = genai.embed_content(
-                model=self.model_name,
-                content=text,
-                task_type="RETRIEVAL_DOCUMENT"
-            )
+            with metrics.timed("embed.document"):
+                result = genai.embed_content(
+                    model=self.model_name,
+                    content=text,
+                    task_type="RETRIEVAL_DOCUMENT",
+                    output_dimensionality=self._output_dimensionality,
+                )
             # The result is an EmbedContentResponse object, access the embedding attribute
             if hasattr(result, 'embedding'):
                 embeddings.append(result.embedding)
@@ -37,55 +75,203 @@ class GoogleGenerativeAIEmbeddings(Embeddings):
                 embeddings.append(result.get('embedding', result.get('embeddings', [result])[0]))
             else:
                 embeddings.append(result)
-        return embeddings
+        return normalize_embeddings(embeddings, self.dimension) if embeddings else embeddings
     
     def embed_query(self, text: str) -> List[float]:
         """Generate embedding for a query string."""
-        result = genai.embed_content(
-            model=self.model_name,
-            content=text,
-            task_type="RETRIEVAL_QUERY"
-        )
+        with metrics.timed("embed.query"):
+            result = genai.embed_content(
+                model=self.model_name,
+                content=text,
+                task_type="RETRIEVAL_QUERY",
+                output_dimensionality=self._output_dimensionality,
+            )
         # The result is an EmbedContentResponse object, access the embedding attribute
         if hasattr(result, 'embedding'):
-            return result.embedding
+            embedding = result.embedding
         elif hasattr(result, 'embeddings') and len(result.embeddings) > 0:
-            return result.embeddings[0]
+            embedding = result.embeddings[0]
         elif isinstance(result, dict):
-            return result.get('embedding', result.get('embeddings', [result])[0])
-        return result
+            embedding = result.get('embedding', result.get('embeddings', [result])[0])
+        else:
+            embedding = result
+        return normalize_embeddings(embedding, self.dimension)
+
+
+def chroma_collection(vector_store: Chroma):
+    """Return the chromadb collection behind a LangChain Chroma store.
+
+    langchain-chroma exposes no public API for collection metadata, counts or
+    writing pre-computed embeddings, so those go through its private
+    ``_collection`` handle. Every such access goes through this function, so
+    a langchain-chroma upgrade that changes it breaks in one place.
+    """
+    return vector_store._collection
+
+
+def open_vector_store(collection_name: str, embeddings: Embeddings, persist_directory: str) -> Chroma:
+    """Open a collection, recording or checking its embedding model and dimension.
+
+    Queries and documents must be embedded the same way, so a collection
+    created with other settings is refused rather than silently mixed.
+    """
+    expected = {
+        "embedding_model": embeddings.model_name,
+        "embedding_dimension": embeddings.dimension,
+    }
+    vector_store = Chroma(
+        collection_name=collection_name,
+        embedding_function=embeddings,
+        persist_directory=persist_directory,
+        collection_metadata=expected,
+    )
+    collection = chroma_collection(vector_store)
+    recorded = collection.metadata or {}
+
+    if "embedding_dimension" not in recorded:
+        # Collections created before dimensions were recorded
+        stored = vector_store.get(limit=1, include=["embeddings"])["embeddings"]
+        if len(stored) and len(stored[0]) != embeddings.dimension:
+            raise EmbeddingMismatchError(
+                f"Collection {collection_name} holds {len(stored[0])}-dimensional vectors, "
+                f"configured dimension is {embeddings.dimension}"
+            )
+        collection.modify(metadata={**recorded, **expected})
+    elif any(recorded.get(key) != value for key, value in expected.items()):
+        raise EmbeddingMismatchError(
+            f"Collection {collection_name} was built with {recorded.get('embedding_model')} "
+            f"at dimension {recorded.get('embedding_dimension')}, configured "
+            f"{embeddings.model_name} at dimension {embeddings.dimension}"
+        )
+    return vector_store
+
+
+class _ChunkWriter:
+    """Splits sections into chunks and stores them in batches in one index."""
+
+    def __init__(
+        self,
+        vector_store: Chroma,
+        spec: IndexSpec,
+        document: Document,
+        batch_size: int,
+        on_batch: Optional[Callable[[int], None]] = None,
+        deadline: Optional[Deadline] = None,
+    ):
+        self.vector_store = vector_store
+        self.spec = spec
+        self.document_id = document.id
+        self.batch_size = batch_size
+        self.on_batch = on_batch
+        self.deadline = deadline
+        self.text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=spec.chunk_size,
+            chunk_overlap=spec.chunk_overlap
+        )
+        self.chunks: List[ChunkDocument] = []
+        self.ids: List[str] = []
+        self.count = 0
+
+    def add(self, text: str, metadata: dict):
+        for chunk in self.text_splitter.split_text(text):
+            self.chunks.append(ChunkDocument(page_content=chunk, metadata=metadata))
+            self.ids.append(f"{self.document_id}:{self.count}")
+            self.count += 1
+            if len(self.chunks) >= self.batch_size:
+                self.flush()
+
+    def flush(self):
+        if not self.chunks:
+            return
+        if self.deadline is not None:
+            self.deadline.check("index.store")
+        # This will make one API call per chunk for embeddings
+        with metrics.timed("index.store"):
+            self.vector_store.add_documents(documents=self.chunks, ids=self.ids)
+        if self.on_batch is not None:
+            self.on_batch(len(self.chunks))
+        self.chunks, self.ids = [], []
 
 
 class GeminiGateway:
-    """Gateway for Google Gemini API integration with caching to reduce API calls."""
+    """Gateway for Google Gemini API integration with caching to reduce API calls.
+
+    The index is versioned: queries read the active version recorded in the
+    index registry, and while a migration builds the next version, new
+    documents are written to both.
+    """
     
     CHROMA_DIR = "./chroma_docs"
+    # Chunks sent to the vector store per add call while a document streams in
+    INDEX_BATCH_SIZE = 64
     
-    # Class-level cache for embeddings and vector store (reused across instances)
-    _embeddings: Optional[GoogleGenerativeAIEmbeddings] = None
-    _vector_store: Optional[Chroma] = None
+    # Class-level cache for the model, registries and vector stores (reused across instances)
     _genai_model: Optional[genai.GenerativeModel] = None
+    _registries: Dict[str, IndexRegistry] = {}
+    _vector_stores: Dict[Tuple[str, str], Chroma] = {}
+    # Indexing runs in worker threads; Chroma clients must not be opened concurrently
+    _vector_stores_lock = threading.Lock()
     
-    def __init__(self):
+    def __init__(self, chroma_dir: Optional[str] = None):
+        self._connect()
+        self.chroma_dir = chroma_dir or self.CHROMA_DIR
+        self.registry = self._registry_for(self.chroma_dir)
+
+    def _connect(self):
+        """Configure the Gemini SDK and the shared chat model.
+
+        The only network setup in the constructor; offline stand-ins override it.
+        """
         genai.configure(api_key=settings.google_api_key)
-        
+
         if GeminiGateway._genai_model is None:
             GeminiGateway._genai_model = genai.GenerativeModel(
                 'gemini-2.0-flash-lite'
             )
-        
-        if GeminiGateway._embeddings is None:
-            GeminiGateway._embeddings = GoogleGenerativeAIEmbeddings(
-                model="gemini-embedding-001"
-                )
-        
-        # Initialize vector store (reused across all instances)
-        if GeminiGateway._vector_store is None:
-            GeminiGateway._vector_store = Chroma(
-                collection_name="documents",
-                embedding_function=GeminiGateway._embeddings,
-                persist_directory=self.CHROMA_DIR
-            )
+
+    def _registry_for(self, directory: str) -> IndexRegistry:
+        registry = GeminiGateway._registries.get(directory)
+        if registry is None:
+            registry = IndexRegistry(directory, self.default_index_spec())
+            GeminiGateway._registries[directory] = registry
+        return registry
+
+    def default_index_spec(self) -> IndexSpec:
+        """The first index version, as described by the settings."""
+        return IndexSpec(
+            version=1,
+            collection="documents",
+            embedding_model=settings.EMBEDDING_MODEL,
+            embedding_dimension=settings.EMBEDDING_DIMENSION,
+            dimension_mode=settings.EMBEDDING_DIMENSION_MODE,
+            chunk_size=settings.CHUNK_SIZE,
+            chunk_overlap=settings.CHUNK_OVERLAP,
+        )
+
+    def make_embeddings(self, spec: IndexSpec) -> Embeddings:
+        return GoogleGenerativeAIEmbeddings(
+            model=spec.embedding_model,
+            dimension=spec.embedding_dimension,
+            truncate=spec.dimension_mode == "truncate",
+        )
+
+    def store_for(self, spec: IndexSpec) -> Chroma:
+        """Get the vector store of one index version (cached)."""
+        key = (self.chroma_dir, spec.collection)
+        vector_store = GeminiGateway._vector_stores.get(key)
+        if vector_store is None:
+            with GeminiGateway._vector_stores_lock:
+                vector_store = GeminiGateway._vector_stores.get(key)
+                if vector_store is None:
+                    vector_store = open_vector_store(spec.collection, self.make_embeddings(spec), self.chroma_dir)
+                    GeminiGateway._vector_stores[key] = vector_store
+        return vector_store
+
+    def drop_index(self, spec: IndexSpec):
+        """Delete the collection of an index version that is no longer used."""
+        self.store_for(spec).delete_collection()
+        with GeminiGateway._vector_stores_lock:
+            GeminiGateway._vector_stores.pop((self.chroma_dir, spec.collection), None)
 
     @property
     def model(self) -> genai.GenerativeModel:
@@ -93,14 +279,22 @@ class GeminiGateway:
         return GeminiGateway._genai_model
 
     @property
-    def embeddings(self) -> GoogleGenerativeAIEmbeddings:
-        """Get the embeddings instance (cached)."""
-        return GeminiGateway._embeddings
+    def embeddings(self) -> Embeddings:
+        """Get the embeddings of the active index."""
+        return self.vector_store.embeddings
 
     @property
     def vector_store(self) -> Chroma:
-        """Get the vector store instance (cached)."""
-        return GeminiGateway._vector_store
+        """Get the vector store of the active index."""
+        return self.store_for(self.registry.active())
+
+    def index_metadata(self) -> dict:
+        """Return the embedding model and dimension recorded for the index."""
+        metadata = chroma_collection(self.vector_store).metadata or {}
+        return {
+            "embedding_model": metadata.get("embedding_model"),
+            "embedding_dimension": metadata.get("embedding_dimension"),
+        }
 
 
     @dynamic_prompt
@@ -125,31 +319,179 @@ class GeminiGateway:
         ]
 
 
-    def index_document(self, document: Document):
-        try:
-            loader = PyPDFLoader(f"./uploaded_files/{document.id}.pdf")
-            documents = loader.load()
+    def index_document(self, document: Document, deadline: Optional[Deadline] = None):
+        """Index a document into the active index and any migration target.
 
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=2000,
-                chunk_overlap=200
-            )
-            all_splits = text_splitter.split_documents(documents)
+        Blocking; ``deadline`` is checked between sections and batches, and
+        chunks already stored are left for the caller to remove.
+        """
+        with metrics.timed("index"):
+            self._index_document(document, self.registry.write_targets(), deadline=deadline)
 
-            # Add documents to vector store
-            # This will make one API call per chunk for embeddings
-            self.vector_store.add_documents(documents=all_splits)
+    def reindex_document(
+        self,
+        document: Document,
+        spec: IndexSpec,
+        on_batch: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """Rebuild a document's chunks in one index version.
+
+        ``on_batch`` is called with the size of each stored batch. Returns
+        the number of chunks written.
+        """
+        self.store_for(spec).delete(where={"document_id": document.id})
+        return self._index_document(document, [spec], on_batch)
+
+    def _index_document(
+        self,
+        document: Document,
+        specs: List[IndexSpec],
+        on_batch: Optional[Callable[[int], None]] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> int:
+        try:
+            writers = []
+            for spec in specs:
+                try:
+                    writers.append(_ChunkWriter(
+                        self.store_for(spec), spec, document, self.INDEX_BATCH_SIZE, on_batch, deadline
+                    ))
+                except Exception as e:
+                    if not writers:
+                        raise
+                    self._fail_migration(spec, document, e)
+            # Sections are split and flushed as they are extracted, so only one
+            # batch of chunks per index is held in memory regardless of document size
+            with open_blob(document.filepath) as stored:
+                extractor, stream = get_extractor(stored, document.mimetype, document.filename)
+                for section in extractor.extract(stream, declared_charset(document.mimetype)):
+                    if deadline is not None:
+                        deadline.check("index.extract")
+                    metadata = {
+                        "source": document.filename,
+                        "document_id": document.id,
+                        **section.metadata,
+                    }
+                    for writer in list(writers):
+                        self._write(writers, writer, document, writer.add, section.text, metadata)
+
+            for writer in list(writers):
+                self._write(writers, writer, document, writer.flush)
+            return writers[0].count
             
+        except RequestCancelled:
+            raise
         except Exception as e:
             # Log the error (you might want to use proper logging)
             error_msg = f"Failed to index document {document.id}: {str(e)}"
             raise RuntimeError(error_msg) from e
 
-    async def generate_response(self, prompt: str) -> str:
-        """Generate a response from the Gemini model with context."""
+    def _write(
+        self,
+        writers: List[_ChunkWriter],
+        writer: _ChunkWriter,
+        document: Document,
+        step: Callable,
+        *args,
+    ):
+        """Run one writer step; a failing migration target is dropped.
+
+        The first writer is the index the document is indexed for and its
+        errors propagate. Any other one is a migration target being
+        dual-written: its failure marks the migration failed, which stops
+        further dual-writes, instead of failing the document.
+        """
+        try:
+            step(*args)
+        except RequestCancelled:
+            raise
+        except Exception as e:
+            if writer is writers[0]:
+                raise
+            writers.remove(writer)
+            self._fail_migration(writer.spec, document, e)
+
+    def _fail_migration(self, spec: IndexSpec, document: Document, error: Exception):
+        metrics.increment("index.migration_write_failed")
+        try:
+            self.registry.update_migration(
+                version=spec.version,
+                status="failed",
+                error=f"Failed to write document {document.id} to version {spec.version}: {error}",
+            )
+        except IndexMigrationError:
+            # Aborted or activated meanwhile
+            pass
+
+    def delete_document(self, document_id: str):
+        """Remove all indexed chunks of a document from every live index version."""
+        try:
+            for spec in self.registry.all_targets():
+                self.store_for(spec).delete(where={"document_id": document_id})
+        except Exception as e:
+            error_msg = f"Failed to delete document {document_id} from index: {str(e)}"
+            raise RuntimeError(error_msg) from e
+
+    def iter_chunks(
+        self,
+        document_ids: Optional[List[str]] = None,
+        batch_size: int = 5000,
+    ) -> Iterator[dict]:
+        """Yield stored chunks with their embeddings in batches.
+
+        Limited to ``document_ids`` when given, otherwise the whole index.
+        """
+        if document_ids is None:
+            yield from self._iter_chunk_pages(None, batch_size)
+            return
+        # Keep $in filters small; Chroma evaluates them per id
+        for start in range(0, len(document_ids), 500):
+            where = {"document_id": {"$in": document_ids[start:start + 500]}}
+            yield from self._iter_chunk_pages(where, batch_size)
+
+    def _iter_chunk_pages(self, where: Optional[dict], batch_size: int) -> Iterator[dict]:
+        offset = 0
+        while True:
+            page = self.vector_store.get(
+                where=where,
+                limit=batch_size,
+                offset=offset,
+                include=["embeddings", "documents", "metadatas"],
+            )
+            if not page["ids"]:
+                return
+            yield page
+            offset += len(page["ids"])
+
+    def chunk_count(self, spec: Optional[IndexSpec] = None) -> int:
+        """Number of chunks stored in one index version, the active one by default."""
+        store = self.store_for(spec) if spec is not None else self.vector_store
+        return chroma_collection(store).count()
+
+    def upsert_chunks(self, ids: List[str], embeddings, documents: List[str], metadatas: List[dict]):
+        """Write pre-computed chunks straight to the index, without embedding calls."""
+        with metrics.timed("index.upsert"):
+            chroma_collection(self.vector_store).upsert(
+                ids=ids,
+                embeddings=embeddings,
+                documents=documents,
+                metadatas=metadatas,
+            )
+
+    async def generate_response(self, prompt: str, deadline: Optional[Deadline] = None) -> str:
+        """Generate a response from the Gemini model with context.
+
+        Each stage is abandoned as soon as ``deadline`` expires or the client
+        disconnects.
+        """
+        deadline = deadline or Deadline()
         try:
-            # Retrieve context
-            retrieved_docs = self.vector_store.similarity_search(prompt, k=5)
+            # Retrieve context; the search blocks, so it runs in a worker thread
+            with metrics.timed("retrieve"):
+                retrieved_docs = await deadline.wait(
+                    asyncio.to_thread(self.vector_store.similarity_search, prompt, k=5),
+                    "retrieve",
+                )
             docs_content = "\n\n".join(doc.page_content for doc in retrieved_docs)
 
             # Build structured prompt
@@ -166,11 +508,20 @@ class GeminiGateway:
             ANSWER:
             """.strip()
 
-            response = await self.model.generate_content_async(
-                contents=[final_prompt]
-            )
+            with metrics.timed("generate"):
+                response = await deadline.wait(
+                    self.model.generate_content_async(contents=[final_prompt]),
+                    "generate",
+                )
 
             return response.text
+        except RequestCancelled:
+            raise
         except Exception as e:
             error_msg = f"Failed to generate response: {str(e)}"
             raise RuntimeError(error_msg) from e
+
+
+def get_gemini_gateway() -> GeminiGateway:
+    """Dependency to get the Gemini gateway."""
+    return GeminiGateway()
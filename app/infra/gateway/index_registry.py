@@ -0,0 +1,243 @@
+# Versioned vector index registry.
+#
+# Each index version lives in its own Chroma collection. The registry file
+# next to the collections says which version is active (the alias queries
+# read from) and which one, if any, is being built by a migration. Every
+# change rewrites the file through os.replace, so readers switch from one
+# version to the next atomically.
+
+import fcntl
+import os
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, List, Literal, Optional
+
+from pydantic import BaseModel, Field, ValidationError, model_validator
+
+from app.domain.config import MAX_EMBEDDING_DIMENSION
+
+
+class IndexMigrationError(RuntimeError):
+    """Raised for invalid index migration state changes."""
+
+
+class IndexSpec(BaseModel):
+    """How one version of the index is chunked and embedded."""
+    version: int
+    collection: str
+    embedding_model: str
+    embedding_dimension: int = Field(gt=0, le=MAX_EMBEDDING_DIMENSION)
+    dimension_mode: Literal["api", "truncate"] = "api"
+    chunk_size: int = Field(2000, gt=0)
+    chunk_overlap: int = Field(200, ge=0)
+    created_at: Optional[datetime] = None
+    activated_at: Optional[datetime] = None
+    # Last snapshot imported into this version; incremental snapshots must build on it
+    snapshot_id: Optional[str] = None
+
+    @model_validator(mode="after")
+    def _check_overlap(self) -> "IndexSpec":
+        if self.chunk_overlap >= self.chunk_size:
+            raise ValueError(
+                f"chunk_overlap ({self.chunk_overlap}) must be smaller than chunk_size ({self.chunk_size})"
+            )
+        return self
+
+
+class MigrationCheckpoint(BaseModel):
+    """Last document fully written to the migration target."""
+    uploaded_at: Optional[datetime] = None
+    document_id: Optional[str] = None
+    documents_done: int = 0
+    chunks_done: int = 0
+
+
+class IndexMigration(BaseModel):
+    target: IndexSpec
+    status: Literal["pending", "running", "paused", "failed"] = "pending"
+    # Set by each claim; a job stops once another run has taken over
+    run_id: Optional[str] = None
+    started_at: datetime
+    updated_at: datetime
+    total_documents: Optional[int] = None
+    checkpoint: MigrationCheckpoint = Field(default_factory=MigrationCheckpoint)
+    error: Optional[str] = None
+
+
+class RegistryState(BaseModel):
+    active: IndexSpec
+    migration: Optional[IndexMigration] = None
+    retired: List[IndexSpec] = Field(default_factory=list)
+    # Versions are never reused, so a dropped collection name stays dead
+    last_version: int = 0
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class IndexRegistry:
+    """File-backed record of the active index version and any migration."""
+
+    FILENAME = "index_registry.json"
+
+    def __init__(self, directory: str, default: IndexSpec):
+        self.directory = directory
+        self.path = os.path.join(directory, self.FILENAME)
+        self.default = default
+        self._state: Optional[RegistryState] = None
+        self._stamp = None
+
+    def state(self) -> RegistryState:
+        """Return the current state, re-reading the file only when it changed."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return RegistryState(active=self.default)
+        stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if stamp != self._stamp:
+            with open(self.path) as f:
+                self._state = RegistryState.model_validate_json(f.read())
+            self._stamp = stamp
+        return self._state
+
+    def active(self) -> IndexSpec:
+        return self.state().active
+
+    def migration(self) -> Optional[IndexMigration]:
+        return self.state().migration
+
+    def write_targets(self) -> List[IndexSpec]:
+        """Indexes new documents go to: the active one plus a migration target.
+
+        A failed migration stops receiving writes; documents added meanwhile
+        are picked up when it resumes.
+        """
+        state = self.state()
+        if state.migration is None or state.migration.status == "failed":
+            return [state.active]
+        return [state.active, state.migration.target]
+
+    def all_targets(self) -> List[IndexSpec]:
+        """The active index plus any migration target, failed or not."""
+        state = self.state()
+        if state.migration is None:
+            return [state.active]
+        return [state.active, state.migration.target]
+
+    def record_snapshot(self, snapshot_id: str) -> IndexSpec:
+        """Remember the snapshot last imported into the active version."""
+        with self._update() as state:
+            state.active = state.active.model_copy(update={"snapshot_id": snapshot_id})
+            return state.active
+
+    def begin_migration(self, **changes) -> IndexMigration:
+        """Start building a new index version; unset fields keep active values.
+
+        Raises ValueError if the resulting settings are invalid, for example
+        a chunk overlap inherited from the active version that is not smaller
+        than a new chunk size.
+        """
+        with self._update() as state:
+            if state.migration is not None:
+                raise IndexMigrationError("An index migration is already in progress")
+            version = max([state.last_version, state.active.version] + [spec.version for spec in state.retired]) + 1
+            state.last_version = version
+            try:
+                target = IndexSpec.model_validate({
+                    **state.active.model_dump(),
+                    **{key: value for key, value in changes.items() if value is not None},
+                    "version": version,
+                    "collection": f"documents_v{version}",
+                    "created_at": _now(),
+                    "activated_at": None,
+                    "snapshot_id": None,
+                })
+            except ValidationError as e:
+                problems = "; ".join(
+                    ": ".join([*map(str, error["loc"]), error["msg"].removeprefix("Value error, ")])
+                    for error in e.errors()
+                )
+                raise ValueError(f"Invalid index settings: {problems}") from None
+            state.migration = IndexMigration(target=target, started_at=_now(), updated_at=_now())
+            return state.migration
+
+    def claim_migration(self, stale_after: timedelta) -> IndexMigration:
+        """Mark the migration as running unless a live job already runs it.
+
+        A running migration whose last update is older than ``stale_after``
+        is taken over; its job is assumed to have died.
+        """
+        with self._update() as state:
+            migration = state.migration
+            if migration is None:
+                raise IndexMigrationError("No index migration in progress")
+            if migration.status == "running" and _now() - migration.updated_at < stale_after:
+                raise IndexMigrationError("The index migration is already running")
+            state.migration = migration.model_copy(update={
+                "status": "running",
+                "run_id": uuid.uuid4().hex,
+                "error": None,
+                "updated_at": _now(),
+            })
+            return state.migration
+
+    def update_migration(self, version: Optional[int] = None, **fields) -> IndexMigration:
+        """Record progress or status of the migration.
+
+        With ``version``, only a migration to that target version is updated.
+        """
+        with self._update() as state:
+            if state.migration is None:
+                raise IndexMigrationError("No index migration in progress")
+            if version is not None and state.migration.target.version != version:
+                raise IndexMigrationError(f"The migration to version {version} was aborted")
+            state.migration = state.migration.model_copy(update={**fields, "updated_at": _now()})
+            return state.migration
+
+    def activate(self, version: Optional[int] = None) -> IndexSpec:
+        """Switch the alias to the migration target and retire the old version."""
+        with self._update() as state:
+            if state.migration is None:
+                raise IndexMigrationError("No index migration in progress")
+            if version is not None and state.migration.target.version != version:
+                raise IndexMigrationError(f"The migration to version {version} was aborted")
+            state.retired.append(state.active)
+            state.active = state.migration.target.model_copy(update={"activated_at": _now()})
+            state.migration = None
+            return state.active
+
+    def abort(self) -> IndexSpec:
+        """Drop the migration; returns the abandoned target."""
+        with self._update() as state:
+            if state.migration is None:
+                raise IndexMigrationError("No index migration in progress")
+            target = state.migration.target
+            state.migration = None
+            return target
+
+    def forget_retired(self) -> List[IndexSpec]:
+        """Remove retired versions from the registry; returns them."""
+        with self._update() as state:
+            retired, state.retired = state.retired, []
+            return retired
+
+    @contextmanager
+    def _update(self) -> Iterator[RegistryState]:
+        """Read-modify-write the registry under an exclusive file lock."""
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.path + ".lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                self._stamp = None
+                state = self.state().model_copy(deep=True)
+                yield state
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, "w") as f:
+                    f.write(state.model_dump_json(indent=2))
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
@@ -0,0 +1,68 @@
+# In-process metrics: per-stage timings and counters.
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+
+class _StageStats:
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+
+class Metrics:
+    """Thread-safe registry of stage timings and counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages: Dict[str, _StageStats] = {}
+        self._counters: Dict[str, float] = {}
+
+    @contextmanager
+    def timed(self, stage: str) -> Iterator[None]:
+        """Record the wall time spent inside the block under ``stage``."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started)
+
+    def observe(self, stage: str, seconds: float):
+        with self._lock:
+            stats = self._stages.get(stage)
+            if stats is None:
+                stats = self._stages[stage] = _StageStats()
+            stats.count += 1
+            stats.total += seconds
+            stats.max = max(stats.max, seconds)
+
+    def increment(self, name: str, value: float = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def snapshot(self) -> dict:
+        """Return a JSON-serializable copy of all stages and counters."""
+        with self._lock:
+            stages = {
+                name: {
+                    "count": stats.count,
+                    "total_ms": stats.total * 1000,
+                    "mean_ms": stats.total / stats.count * 1000 if stats.count else 0.0,
+                    "max_ms": stats.max * 1000,
+                }
+                for name, stats in self._stages.items()
+            }
+            return {"stages": stages, "counters": dict(self._counters)}
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+
+
+metrics = Metrics()
@@ -1,6 +1,14 @@
 """Repositories package."""
 
+from app.infra.repositories.blob import BlobRepository, BlobModel
+from app.infra.repositories.corpus_version import CorpusVersionRepository, CorpusVersionModel
 from app.infra.repositories.document import DocumentRepository, DocumentModel
 
-__all__ = ["DocumentRepository", "DocumentModel"]
-
+__all__ = [
+    "BlobRepository",
+    "BlobModel",
+    "CorpusVersionRepository",
+    "CorpusVersionModel",
+    "DocumentRepository",
+    "DocumentModel",
+]
@@ -0,0 +1,179 @@
+from datetime import datetime, timezone
+from typing import Callable, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.types import DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.infra.database import Base
+from app.domain.entities import Blob
+
+# SQLAlchemy model
+class BlobModel(Base):
+    """SQLAlchemy model for a stored, content-addressed file."""
+    __tablename__ = "blobs"
+
+    key: Mapped[str] = mapped_column(primary_key=True)
+    path: Mapped[str] = mapped_column(nullable=False)
+    size: Mapped[int] = mapped_column(nullable=False)
+    stored_size: Mapped[int] = mapped_column(nullable=False)
+    compressed: Mapped[bool] = mapped_column(nullable=False)
+    refcount: Mapped[int] = mapped_column(nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
+class BlobRepository:
+    """Repository for blob reference counting."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get(self, key: str) -> Optional[Blob]:
+        """Retrieve a blob by its content key."""
+        result = await self.session.execute(
+            select(BlobModel)
+            .where(BlobModel.key == key)
+            # Reference counts change through bulk updates; skip the identity map
+            .execution_options(populate_existing=True)
+        )
+        blob_model = result.scalar_one_or_none()
+        if blob_model:
+            return self._model_to_entity(blob_model)
+        return None
+
+    async def acquire(self, blob: Blob) -> Tuple[Blob, bool]:
+        """Add a reference to ``blob``, creating it on first use.
+
+        Returns the stored blob and whether this call created it.
+        """
+        if await self._increment(blob.key):
+            return await self.get(blob.key), False
+
+        self.session.add(BlobModel(
+            key=blob.key,
+            path=blob.path,
+            size=blob.size,
+            stored_size=blob.stored_size,
+            compressed=blob.compressed,
+            refcount=1,
+            created_at=datetime.now(timezone.utc),
+        ))
+        try:
+            await self.session.commit()
+        except IntegrityError:
+            # Another writer stored the same content first
+            await self.session.rollback()
+            await self._increment(blob.key)
+            return await self.get(blob.key), False
+        return await self.get(blob.key), True
+
+    async def release(self, key: str, on_unused: Optional[Callable[[Blob], None]] = None) -> Optional[Blob]:
+        """Drop a reference to a blob, deleting the row at zero.
+
+        ``on_unused`` runs before the commit once the row is gone, while the
+        transaction still holds the row, so no other writer can take a new
+        reference in between. Returns the blob with its remaining reference
+        count, or ``None`` if the blob is unknown.
+        """
+        try:
+            blob = await self.drop_reference(key, on_unused)
+            if blob is None:
+                await self.session.rollback()
+                return None
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+        return blob
+
+    async def add_reference(self, blob: Blob) -> Blob:
+        """Add a reference in the caller's transaction, without committing."""
+        if not await self._increment(blob.key, commit=False):
+            self.session.add(BlobModel(
+                key=blob.key,
+                path=blob.path,
+                size=blob.size,
+                stored_size=blob.stored_size,
+                compressed=blob.compressed,
+                refcount=1,
+                created_at=datetime.now(timezone.utc),
+            ))
+            await self.session.flush()
+        return await self.get(blob.key)
+
+    async def drop_reference(
+        self,
+        key: str,
+        on_unused: Optional[Callable[[Blob], None]] = None,
+    ) -> Optional[Blob]:
+        """Drop a reference in the caller's transaction, without committing.
+
+        At zero the row is deleted and ``on_unused`` is called with the blob.
+        """
+        await self.session.execute(
+            update(BlobModel)
+            .where(BlobModel.key == key)
+            .values(refcount=BlobModel.refcount - 1)
+        )
+        result = await self.session.execute(
+            select(BlobModel)
+            .where(BlobModel.key == key)
+            .execution_options(populate_existing=True)
+        )
+        blob_model = result.scalar_one_or_none()
+        if blob_model is None:
+            return None
+
+        blob = self._model_to_entity(blob_model)
+        if blob_model.refcount <= 0:
+            blob.refcount = 0
+            await self.session.delete(blob_model)
+            await self.session.flush()
+            if on_unused is not None:
+                on_unused(blob)
+        return blob
+
+    async def stats(self) -> dict:
+        """Return blob count and logical vs. stored byte totals."""
+        result = await self.session.execute(
+            select(
+                func.count(BlobModel.key),
+                func.coalesce(func.sum(BlobModel.refcount), 0),
+                func.coalesce(func.sum(BlobModel.size * BlobModel.refcount), 0),
+                func.coalesce(func.sum(BlobModel.size), 0),
+                func.coalesce(func.sum(BlobModel.stored_size), 0),
+            )
+        )
+        blobs, references, logical_bytes, unique_bytes, stored_bytes = result.one()
+        return {
+            "blobs": blobs,
+            "references": references,
+            "logical_bytes": logical_bytes,
+            "unique_bytes": unique_bytes,
+            "stored_bytes": stored_bytes,
+            "saved_bytes": logical_bytes - stored_bytes,
+        }
+
+    async def _increment(self, key: str, commit: bool = True) -> bool:
+        result = await self.session.execute(
+            update(BlobModel)
+            .where(BlobModel.key == key)
+            .values(refcount=BlobModel.refcount + 1)
+        )
+        if commit:
+            await self.session.commit()
+        return result.rowcount > 0
+
+    @staticmethod
+    def _model_to_entity(model: BlobModel) -> Blob:
+        """Convert SQLAlchemy model to domain entity."""
+        return Blob(
+            key=model.key,
+            path=model.path,
+            size=model.size,
+            stored_size=model.stored_size,
+            compressed=model.compressed,
+            refcount=model.refcount,
+            created_at=model.created_at,
+        )
@@ -0,0 +1,55 @@
+import uuid
+from datetime import datetime, timezone
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update
+from sqlalchemy.types import DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.infra.database import Base
+
+# SQLAlchemy model
+class CorpusVersionModel(Base):
+    """Single-row counter bumped by every change to the documents table."""
+    __tablename__ = "corpus_version"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    # Random per database, so versions from a recreated database never repeat
+    epoch: Mapped[str] = mapped_column(nullable=False)
+    version: Mapped[int] = mapped_column(nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
+class CorpusVersionRepository:
+    """Repository for the corpus version used to validate cached reads."""
+
+    ROW_ID = 1
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get(self) -> str:
+        """Return the current version as an opaque token."""
+        result = await self.session.execute(
+            select(CorpusVersionModel.epoch, CorpusVersionModel.version)
+            .where(CorpusVersionModel.id == self.ROW_ID)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return "0"
+        return f"{row.epoch}.{row.version}"
+
+    async def bump(self):
+        """Increment the version in the caller's transaction, without committing."""
+        result = await self.session.execute(
+            update(CorpusVersionModel)
+            .where(CorpusVersionModel.id == self.ROW_ID)
+            .values(version=CorpusVersionModel.version + 1, updated_at=datetime.now(timezone.utc))
+        )
+        if result.rowcount == 0:
+            # Databases created without migrations have no row yet
+            self.session.add(CorpusVersionModel(
+                id=self.ROW_ID,
+                epoch=uuid.uuid4().hex[:12],
+                version=1,
+                updated_at=datetime.now(timezone.utc),
+            ))
@@ -1,12 +1,14 @@
 from datetime import datetime
-from typing import Optional, List
+from typing import Callable, Dict, Optional, List
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import delete, select
 from sqlalchemy.types import DateTime
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.infra.database import Base
-from app.domain.entities import Document
+from app.infra.repositories.blob import BlobRepository
+from app.infra.repositories.corpus_version import CorpusVersionRepository
+from app.domain.entities import Blob, Document
 
 # SQLAlchemy model
 class DocumentModel(Base):
@@ -16,30 +18,30 @@ class DocumentModel(Base):
     id: Mapped[str] = mapped_column(primary_key=True)
     filename: Mapped[str] = mapped_column(nullable=False)
     filepath: Mapped[str] = mapped_column(nullable=False)
-    uploaded_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    uploaded_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
     mimetype: Mapped[Optional[str]] = mapped_column(nullable=True)
     size: Mapped[Optional[int]] = mapped_column(nullable=True)
     description: Mapped[Optional[str]] = mapped_column(nullable=True)
+    content_hash: Mapped[Optional[str]] = mapped_column(nullable=True, index=True)
 
 
 class DocumentRepository:
-    """Repository for Document CRUD operations."""
+    """Repository for Document CRUD operations.
+
+    Every change bumps the corpus version in the same transaction. Deletes
+    also drop the document's blob reference in that transaction.
+    """
 
     def __init__(self, session: AsyncSession):
         self.session = session
+        self.corpus_version = CorpusVersionRepository(session)
+        self.blobs = BlobRepository(session)
 
     async def create(self, document: Document) -> Document:
         """Save a new document to the database."""
-        document_model = DocumentModel(
-            id=document.id,
-            filename=document.filename,
-            filepath=document.filepath,
-            uploaded_at=document.uploaded_at,
-            mimetype=document.mimetype,
-            size=document.size,
-            description=document.description,
-        )
+        document_model = self._entity_to_model(document)
         self.session.add(document_model)
+        await self.corpus_version.bump()
         await self.session.commit()
         await self.session.refresh(document_model)
         return self._model_to_entity(document_model)
@@ -60,6 +62,17 @@ class DocumentRepository:
         document_models = result.scalars().all()
         return [self._model_to_entity(model) for model in document_models]
 
+    async def get_page(self, offset: int, limit: int) -> List[Document]:
+        """Retrieve documents in upload order, paginated in SQL."""
+        result = await self.session.execute(
+            select(DocumentModel)
+            .order_by(DocumentModel.uploaded_at, DocumentModel.id)
+            .offset(offset)
+            .limit(limit)
+        )
+        document_models = result.scalars().all()
+        return [self._model_to_entity(model) for model in document_models]
+
     async def update(self, document: Document) -> Optional[Document]:
         """Update an existing document."""
         result = await self.session.execute(
@@ -75,24 +88,128 @@ class DocumentRepository:
         document_model.mimetype = document.mimetype
         document_model.size = document.size
         document_model.description = document.description
+        document_model.content_hash = document.content_hash
 
+        await self.corpus_version.bump()
         await self.session.commit()
         await self.session.refresh(document_model)
         return self._model_to_entity(document_model)
 
-    async def delete(self, document_id: str) -> bool:
-        """Delete a document by its ID."""
-        result = await self.session.execute(
-            select(DocumentModel).where(DocumentModel.id == document_id)
-        )
-        document_model = result.scalar_one_or_none()
-        if not document_model:
-            return False
-
-        await self.session.delete(document_model)
-        await self.session.commit()
+    async def delete(
+        self,
+        document_id: str,
+        on_blob_unused: Optional[Callable[[Blob], None]] = None,
+    ) -> bool:
+        """Delete a document by its ID and release its blob.
+
+        Returns False if the document does not exist, including when a
+        concurrent delete removed it first; its blob is then left alone.
+        ``on_blob_unused`` is called before the commit when the last
+        reference to the blob goes away.
+        """
+        try:
+            # The DELETE comes first so concurrent deletes serialize on it
+            result = await self.session.execute(
+                delete(DocumentModel)
+                .where(DocumentModel.id == document_id)
+                .returning(DocumentModel.content_hash)
+            )
+            row = result.one_or_none()
+            if row is None:
+                await self.session.rollback()
+                return False
+
+            if row.content_hash:
+                await self.blobs.drop_reference(row.content_hash, on_blob_unused)
+            await self.corpus_version.bump()
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
         return True
 
+    async def upsert_many(
+        self,
+        documents: List[Document],
+        blobs: Optional[Dict[str, Blob]] = None,
+        on_blob_unused: Optional[Callable[[Blob], None]] = None,
+    ) -> int:
+        """Insert or replace documents in a single transaction.
+
+        Blob references follow the documents' content hashes: a new or
+        changed hash takes a reference, a replaced one is released.
+        ``blobs`` maps content hashes to their blobs, so rows can be created
+        for content no local document referenced before.
+        """
+        blobs = blobs or {}
+        try:
+            previous = await self._content_hashes([document.id for document in documents])
+            for document in documents:
+                old_hash = previous.get(document.id)
+                if document.content_hash != old_hash:
+                    if document.content_hash:
+                        await self.blobs.add_reference(blobs[document.content_hash])
+                    if old_hash:
+                        await self.blobs.drop_reference(old_hash, on_blob_unused)
+                await self.session.merge(self._entity_to_model(document))
+            await self.corpus_version.bump()
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+        return len(documents)
+
+    async def delete_many(
+        self,
+        document_ids: List[str],
+        on_blob_unused: Optional[Callable[[Blob], None]] = None,
+    ) -> int:
+        """Delete documents by ID and release their blobs in a single transaction."""
+        if not document_ids:
+            return 0
+        try:
+            result = await self.session.execute(
+                delete(DocumentModel)
+                .where(DocumentModel.id.in_(document_ids))
+                .returning(DocumentModel.content_hash)
+            )
+            content_hashes = result.scalars().all()
+            for content_hash in content_hashes:
+                if content_hash:
+                    await self.blobs.drop_reference(content_hash, on_blob_unused)
+            await self.corpus_version.bump()
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+        return len(content_hashes)
+
+    async def _content_hashes(self, document_ids: List[str]) -> Dict[str, Optional[str]]:
+        """Return the stored content hash of each existing document."""
+        hashes = {}
+        # Stay well under the bound-parameter limit of SQLite
+        for start in range(0, len(document_ids), 1000):
+            result = await self.session.execute(
+                select(DocumentModel.id, DocumentModel.content_hash)
+                .where(DocumentModel.id.in_(document_ids[start:start + 1000]))
+            )
+            hashes.update(result.tuples().all())
+        return hashes
+
+    @staticmethod
+    def _entity_to_model(document: Document) -> DocumentModel:
+        """Convert domain entity to SQLAlchemy model."""
+        return DocumentModel(
+            id=document.id,
+            filename=document.filename,
+            filepath=document.filepath,
+            uploaded_at=document.uploaded_at,
+            mimetype=document.mimetype,
+            size=document.size,
+            description=document.description,
+            content_hash=document.content_hash,
+        )
+
     @staticmethod
     def _model_to_entity(model: DocumentModel) -> Document:
         """Convert SQLAlchemy model to domain entity."""
@@ -104,5 +221,6 @@ class DocumentRepository:
             mimetype=model.mimetype,
             size=model.size,
             description=model.description,
+            content_hash=model.content_hash,
         )
 
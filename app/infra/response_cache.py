@@ -0,0 +1,49 @@
+# In-process cache of rendered read responses.
+#
+# Keys include the corpus version the response was rendered at, so an entry
+# is never served after the corpus changes; stale entries simply age out of
+# the LRU.
+
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+from app.domain.config import settings
+from app.infra.metrics import metrics
+
+
+class ResponseCache:
+    """Bounded LRU mapping of request keys to serialized response bodies."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+        metrics.increment("response_cache.hit" if body is not None else "response_cache.miss")
+        return body
+
+    def put(self, key: Hashable, body: bytes):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+response_cache = ResponseCache(settings.RESPONSE_CACHE_SIZE)
@@ -0,0 +1,263 @@
+# Snapshot file format for the vector index and documents table.
+#
+# A snapshot is a tar stream compressed with zstd (frame checksums on). The
+# first member is manifest.json, holding the format version, counts and a
+# SHA-256 per member, followed by:
+#
+#   documents.jsonl      one document row per line
+#   document_ids.jsonl   incremental only: ids of every live document, so the
+#                        importer can drop documents deleted since the base
+#   chunks.bin           per chunk: <u32 length><json {id, document, metadata}>
+#                        <dimension x float32 little-endian embedding>
+
+import hashlib
+import io
+import json
+import os
+import shutil
+import struct
+import tarfile
+import tempfile
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import zstandard
+
+SNAPSHOT_FORMAT = "mydocassistant-snapshot"
+SNAPSHOT_VERSION = 1
+
+MANIFEST = "manifest.json"
+DOCUMENTS = "documents.jsonl"
+DOCUMENT_IDS = "document_ids.jsonl"
+CHUNKS = "chunks.bin"
+
+_FRAME_HEADER = struct.Struct("<I")
+_COPY_SIZE = 1024 * 1024
+
+
+class SnapshotError(ValueError):
+    """Raised for malformed, corrupted or incompatible snapshot files."""
+
+
+class _HashingFile:
+    """Write-only file that tracks the SHA-256 and size of its content."""
+
+    def __init__(self, path: str):
+        self._file = open(path, "wb")
+        self._hash = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data: bytes):
+        self._hash.update(data)
+        self.size += len(data)
+        self._file.write(data)
+
+    def close(self) -> dict:
+        self._file.close()
+        return {"sha256": self._hash.hexdigest(), "size": self.size}
+
+
+class SnapshotWriter:
+    """Stage snapshot members on disk, then pack them into one file."""
+
+    def __init__(self, path: str, compression_level: int = 3):
+        self.path = path
+        self.compression_level = compression_level
+        self._staging = tempfile.mkdtemp(prefix="snapshot-")
+        self._members: dict = {}
+        self._counts: dict = {}
+        self.dimension: Optional[int] = None
+
+    def write_jsonl(self, name: str, rows: Iterable[dict]) -> int:
+        out = _HashingFile(os.path.join(self._staging, name))
+        count = 0
+        for row in rows:
+            out.write(json.dumps(row, separators=(",", ":")).encode("utf-8") + b"\n")
+            count += 1
+        self._members[name] = out.close()
+        self._counts[name] = count
+        return count
+
+    def write_chunks(self, batches: Iterable[dict]) -> int:
+        """Write chunk batches shaped like Chroma ``get`` results."""
+        out = _HashingFile(os.path.join(self._staging, CHUNKS))
+        count = 0
+        for batch in batches:
+            embeddings = np.asarray(batch["embeddings"], dtype="<f4")
+            if not len(embeddings):
+                continue
+            if self.dimension is None:
+                self.dimension = int(embeddings.shape[1])
+            elif embeddings.shape[1] != self.dimension:
+                raise SnapshotError("Chunks with different embedding dimensions")
+            for chunk_id, text, metadata, vector in zip(
+                batch["ids"], batch["documents"], batch["metadatas"], embeddings
+            ):
+                record = json.dumps(
+                    {"id": chunk_id, "document": text, "metadata": metadata or {}},
+                    separators=(",", ":"),
+                ).encode("utf-8")
+                out.write(_FRAME_HEADER.pack(len(record)) + record + vector.tobytes())
+                count += 1
+        self._members[CHUNKS] = out.close()
+        self._counts[CHUNKS] = count
+        return count
+
+    def finish(self, **fields) -> dict:
+        """Write the manifest and pack all members; returns the manifest."""
+        manifest = {
+            "format": SNAPSHOT_FORMAT,
+            "version": SNAPSHOT_VERSION,
+            "dimension": self.dimension,
+            "counts": self._counts,
+            "members": self._members,
+            **fields,
+        }
+        tmp_path = f"{self.path}.tmp"
+        try:
+            compressor = zstandard.ZstdCompressor(
+                level=self.compression_level, write_checksum=True, threads=-1
+            )
+            with open(tmp_path, "wb") as raw, compressor.stream_writer(raw) as out:
+                with tarfile.open(fileobj=out, mode="w|") as tar:
+                    data = json.dumps(manifest, indent=2).encode("utf-8")
+                    info = tarfile.TarInfo(MANIFEST)
+                    info.size = len(data)
+                    tar.addfile(info, io.BytesIO(data))
+                    for name in self._members:
+                        tar.add(os.path.join(self._staging, name), arcname=name)
+            os.replace(tmp_path, self.path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            self.cleanup()
+        return manifest
+
+    def cleanup(self):
+        shutil.rmtree(self._staging, ignore_errors=True)
+
+
+class SnapshotReader:
+    """Sequential reader for snapshot files."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def _open(self) -> Tuple[BinaryIO, tarfile.TarFile]:
+        raw = open(self.path, "rb")
+        stream = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        try:
+            return stream, tarfile.open(fileobj=stream, mode="r|")
+        except (tarfile.TarError, zstandard.ZstdError) as e:
+            stream.close()
+            raise SnapshotError(f"Not a snapshot file: {e}") from e
+
+    @staticmethod
+    def _check_manifest(manifest: dict) -> dict:
+        if manifest.get("format") != SNAPSHOT_FORMAT:
+            raise SnapshotError("Not a snapshot file")
+        if manifest.get("version") != SNAPSHOT_VERSION:
+            raise SnapshotError(f"Unsupported snapshot version {manifest.get('version')}")
+        return manifest
+
+    def members(self) -> Iterator[Tuple[dict, str, BinaryIO]]:
+        """Yield ``(manifest, name, file)`` for each data member in order."""
+        stream, tar = self._open()
+        try:
+            manifest = None
+            for info in tar:
+                member = tar.extractfile(info)
+                if member is None:
+                    continue
+                if manifest is None:
+                    if info.name != MANIFEST:
+                        raise SnapshotError("Snapshot does not start with a manifest")
+                    manifest = self._check_manifest(json.load(member))
+                    continue
+                if info.name not in manifest["members"]:
+                    raise SnapshotError(f"Unexpected snapshot member {info.name}")
+                yield manifest, info.name, member
+        except (tarfile.TarError, zstandard.ZstdError) as e:
+            raise SnapshotError(f"Corrupted snapshot: {e}") from e
+        finally:
+            tar.close()
+            stream.close()
+
+    def verify(self) -> dict:
+        """Check every member against the manifest checksums."""
+        manifest = None
+        seen = set()
+        for manifest, name, member in self.members():
+            digest = hashlib.sha256()
+            size = 0
+            while True:
+                data = member.read(_COPY_SIZE)
+                if not data:
+                    break
+                digest.update(data)
+                size += len(data)
+            expected = manifest["members"][name]
+            if digest.hexdigest() != expected["sha256"] or size != expected["size"]:
+                raise SnapshotError(f"Checksum mismatch for {name}")
+            seen.add(name)
+        if manifest is None:
+            raise SnapshotError("Empty snapshot")
+        missing = set(manifest["members"]) - seen
+        if missing:
+            raise SnapshotError(f"Snapshot is missing {', '.join(sorted(missing))}")
+        return manifest
+
+
+def read_manifest(path: str) -> dict:
+    """Return a snapshot's manifest without reading its members."""
+    reader = SnapshotReader(path)
+    stream, tar = reader._open()
+    try:
+        info = tar.next()
+        if info is None or info.name != MANIFEST:
+            raise SnapshotError("Snapshot does not start with a manifest")
+        return reader._check_manifest(json.load(tar.extractfile(info)))
+    finally:
+        tar.close()
+        stream.close()
+
+
+def iter_jsonl(member: BinaryIO, batch_size: int) -> Iterator[List[dict]]:
+    batch = []
+    for line in member:
+        batch.append(json.loads(line))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_chunks(member: BinaryIO, dimension: int, batch_size: int) -> Iterator[dict]:
+    """Yield chunk batches shaped for a Chroma ``upsert``."""
+    vector_size = dimension * 4
+    batch = {"ids": [], "documents": [], "metadatas": [], "embeddings": []}
+    while True:
+        header = member.read(_FRAME_HEADER.size)
+        if not header:
+            break
+        (length,) = _FRAME_HEADER.unpack(header)
+        record = json.loads(member.read(length))
+        vector = member.read(vector_size)
+        if len(vector) != vector_size:
+            raise SnapshotError("Truncated chunk record")
+        batch["ids"].append(record["id"])
+        batch["documents"].append(record["document"])
+        batch["metadatas"].append(record["metadata"] or None)
+        batch["embeddings"].append(vector)
+        if len(batch["ids"]) >= batch_size:
+            yield _finish_batch(batch, dimension)
+            batch = {"ids": [], "documents": [], "metadatas": [], "embeddings": []}
+    if batch["ids"]:
+        yield _finish_batch(batch, dimension)
+
+
+def _finish_batch(batch: dict, dimension: int) -> dict:
+    vectors = np.frombuffer(b"".join(batch["embeddings"]), dtype="<f4")
+    batch["embeddings"] = vectors.reshape(-1, dimension)
+    return batch
@@ -0,0 +1,5 @@
+"""Storage for uploaded files."""
+
+from app.infra.storage.blob_store import BlobStore, iter_file, iter_upload, open_blob
+
+__all__ = ["BlobStore", "iter_file", "iter_upload", "open_blob"]
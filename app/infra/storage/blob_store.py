@@ -0,0 +1,192 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+from typing import AsyncIterator, BinaryIO, Optional
+
+import zstandard
+from fastapi import UploadFile
+
+from app.domain.config import settings
+from app.domain.entities import Blob
+from app.infra.metrics import metrics
+from app.infra.repositories import BlobRepository
+
+# Bytes read from an upload or file per write step
+CHUNK_SIZE = 1024 * 1024
+
+COMPRESSED_SUFFIX = ".zst"
+
+
+async def iter_upload(file: UploadFile) -> AsyncIterator[bytes]:
+    """Yield the content of an uploaded file in chunks."""
+    await file.seek(0)
+    while True:
+        chunk = await file.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        yield chunk
+
+
+async def iter_file(path: str) -> AsyncIterator[bytes]:
+    """Yield the content of a local file in chunks."""
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+
+def open_blob(path: str) -> BinaryIO:
+    """Open a stored file for reading, decompressing it on the fly.
+
+    Compressed blobs come back as a forward-only stream; plain files, such as
+    uploads stored before blob storage existed, are opened as they are.
+    """
+    f = open(path, "rb")
+    if path.endswith(COMPRESSED_SUFFIX):
+        return zstandard.ZstdDecompressor().stream_reader(f, closefd=True)
+    return f
+
+
+class _BlobWriter:
+    """Hashes, compresses and writes one blob to a temporary file.
+
+    Blocking; each step runs in a worker thread so large uploads don't stall
+    the event loop.
+    """
+
+    def __init__(self, tmp_dir: str, compress: bool, compression_level: int):
+        fd, self.path = tempfile.mkstemp(dir=tmp_dir)
+        self.raw = os.fdopen(fd, "wb")
+        self.compress = compress
+        if compress:
+            compressor = zstandard.ZstdCompressor(level=compression_level)
+            self.out = compressor.stream_writer(self.raw, closefd=False)
+        else:
+            self.out = self.raw
+        self.hasher = hashlib.sha256()
+        self.size = 0
+
+    def write(self, chunk: bytes):
+        self.hasher.update(chunk)
+        self.size += len(chunk)
+        self.out.write(chunk)
+
+    def close(self):
+        if self.compress and not self.out.closed:
+            self.out.flush(zstandard.FLUSH_FRAME)
+            self.out.close()
+        self.raw.close()
+
+
+class BlobStore:
+    """Content-addressed file storage with reference counting.
+
+    Files are keyed by the SHA-256 of their content and fanned out over two
+    levels of directories (``ab/cd/abcd...``) so no single directory grows
+    large. Identical uploads share one stored file; the file is removed when
+    its last reference is released.
+
+    Reference counts live in the database. A file is only removed inside the
+    transaction that deletes its row, and only moved into place after the
+    transaction creating the row commits, so processes sharing the storage
+    directory cannot delete a file another one has just referenced.
+    """
+
+    def __init__(
+        self,
+        blob_repository: BlobRepository,
+        root: Optional[str] = None,
+        compress: Optional[bool] = None,
+        compression_level: Optional[int] = None,
+    ):
+        self.blob_repository = blob_repository
+        self.root = root or settings.BLOB_STORAGE_DIR
+        self.compress = settings.BLOB_COMPRESSION if compress is None else compress
+        self.compression_level = (
+            settings.BLOB_COMPRESSION_LEVEL if compression_level is None else compression_level
+        )
+        self.tmp_dir = os.path.join(self.root, "tmp")
+        os.makedirs(self.tmp_dir, exist_ok=True)
+
+    def path_for(self, key: str, compressed: bool) -> str:
+        """Return the sharded storage path of a content key."""
+        filename = key + COMPRESSED_SUFFIX if compressed else key
+        return os.path.join(self.root, key[:2], key[2:4], filename)
+
+    def describe(self, key: str, path: str, size: int) -> Blob:
+        """Describe a stored file that has no row yet.
+
+        Used for files written by another node sharing the storage directory.
+        """
+        return Blob(
+            key=key,
+            path=path,
+            size=size,
+            stored_size=os.path.getsize(path) if os.path.exists(path) else size,
+            compressed=path.endswith(COMPRESSED_SUFFIX),
+            refcount=1,
+        )
+
+    async def put(self, chunks: AsyncIterator[bytes]) -> Blob:
+        """Store a stream of bytes and take a reference to it."""
+        writer = await asyncio.to_thread(
+            _BlobWriter, self.tmp_dir, self.compress, self.compression_level
+        )
+        try:
+            try:
+                async for chunk in chunks:
+                    await asyncio.to_thread(writer.write, chunk)
+            finally:
+                await asyncio.to_thread(writer.close)
+
+            key = writer.hasher.hexdigest()
+            candidate = Blob(
+                key=key,
+                path=self.path_for(key, self.compress),
+                size=writer.size,
+                stored_size=os.path.getsize(writer.path),
+                compressed=self.compress,
+                refcount=1,
+            )
+            blob, created = await self.blob_repository.acquire(candidate)
+            # Also restore the file if a previous writer crashed before moving it
+            if created or not os.path.exists(blob.path):
+                os.makedirs(os.path.dirname(blob.path), exist_ok=True)
+                os.replace(writer.path, blob.path)
+            return blob
+        finally:
+            if os.path.exists(writer.path):
+                os.remove(writer.path)
+
+    async def put_upload(self, file: UploadFile) -> Blob:
+        with metrics.timed("blob.put"):
+            return await self.put(iter_upload(file))
+
+    async def put_file(self, path: str) -> Blob:
+        return await self.put(iter_file(path))
+
+    async def release(self, key: str) -> Optional[Blob]:
+        """Drop a reference to a blob and delete its file when unused."""
+        return await self.blob_repository.release(key, on_unused=self.remove_file)
+
+    @staticmethod
+    def remove_file(blob: Blob):
+        """Delete the file of a blob whose row is being deleted.
+
+        Passed as the ``on_unused`` callback of repository deletes.
+        """
+        if os.path.exists(blob.path):
+            os.remove(blob.path)
+            try:
+                # Prune shard directories left empty; stops at the first non-empty one
+                os.removedirs(os.path.dirname(blob.path))
+            except OSError:
+                pass
+
+    async def stats(self) -> dict:
+        """Return storage totals, including bytes saved by dedup and compression."""
+        return await self.blob_repository.stats()
+
@@ -0,0 +1,6 @@
+"""Benchmarks and load tests. Run modules with ``python -m benchmarks.<name>``."""
+
+import os
+
+# The app settings require an API key at import time; benchmarks never call Google
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
@@ -0,0 +1,86 @@
+"""Per-format extraction throughput.
+
+Usage:
+    python -m benchmarks.bench_extractors --sections 200 --repeat 5
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.corpus import GENERATORS
+from app.infra.extractors import (
+    HEADER_BYTES,
+    UnsupportedDocumentTypeError,
+    get_extractor,
+    resolve_extractor,
+)
+
+# A PNG signature followed by padding, used to time upload-time rejection
+PNG_HEADER = b"\x89PNG\r\n\x1a\n" + b"\x00" * (HEADER_BYTES - 8)
+
+
+def bench_format(path: str, mimetype: str, repeat: int) -> dict:
+    size = os.path.getsize(path)
+    timings = []
+    sections = chars = 0
+    for _ in range(repeat):
+        sections = chars = 0
+        started = time.perf_counter()
+        with open(path, "rb") as stream:
+            extractor, stream = get_extractor(stream, mimetype, path)
+            for section in extractor.extract(stream):
+                sections += 1
+                chars += len(section.text)
+        timings.append(time.perf_counter() - started)
+    best = min(timings)
+    return {
+        "bytes": size,
+        "sections": sections,
+        "chars": chars,
+        "best_seconds": best,
+        "mb_per_second": size / best / 1e6,
+        "sections_per_second": sections / best,
+    }
+
+
+def bench_rejection(iterations: int) -> dict:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        try:
+            resolve_extractor(PNG_HEADER, "text/plain", "image.txt")
+        except UnsupportedDocumentTypeError:
+            pass
+    elapsed = time.perf_counter() - started
+    return {"iterations": iterations, "microseconds_per_check": elapsed / iterations * 1e6}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sections", type=int, default=200, help="pages/sections per file")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--formats", nargs="*", default=list(GENERATORS))
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = {"sections": args.sections, "formats": {}}
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in args.formats:
+            generate, extension, mimetype = GENERATORS[name]
+            path = os.path.join(workdir, f"sample{extension}")
+            with open(path, "wb") as f:
+                f.write(generate(args.sections))
+            report["formats"][name] = bench_format(path, mimetype, args.repeat)
+    report["rejection"] = bench_rejection(10_000)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
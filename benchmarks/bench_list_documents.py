@@ -0,0 +1,179 @@
+"""Serialization cost and throughput of the document list endpoint.
+
+Compares the previous implementation (load every row, slice in Python, build
+pydantic models and re-serialize through ``JSONResponse``) with the current
+one (SQL pagination and orjson), then measures ``GET /documents/`` with the
+response cache disabled, with it enabled, and for clients revalidating their
+ETag (304).
+
+Usage:
+    python -m benchmarks.bench_list_documents --documents 5000 --requests 2000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from benchmarks.load_test import run_phase
+
+
+def _seed_documents(count: int):
+    from app.domain.entities import Document
+
+    started = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return [
+        Document(
+            id=str(uuid.uuid4()),
+            filename=f"report-{index}.pdf",
+            filepath=f"uploaded_files/{index:02x}/report-{index}.pdf.zst",
+            uploaded_at=started + timedelta(seconds=index),
+            mimetype="application/pdf",
+            size=10_000 + index,
+            description=f"Quarterly report number {index}",
+        )
+        for index in range(count)
+    ]
+
+
+def _legacy_body(documents, page: int, limit: int) -> bytes:
+    """Serialize a page the way list_documents did before orjson."""
+    from fastapi.responses import JSONResponse
+
+    from app.domain.dto.response import ListDocumentsResponse
+    from app.domain.dto.response.list_documents import DocumentListItem
+
+    start = (page - 1) * limit
+    response = ListDocumentsResponse(
+        documents=[
+            DocumentListItem(
+                id=doc.id,
+                filename=doc.filename,
+                uploaded_at=doc.uploaded_at.isoformat() if doc.uploaded_at else "",
+                mimetype=doc.mimetype,
+                size=doc.size,
+                description=doc.description,
+            ) for doc in documents[start:start + limit]
+        ],
+        page=page,
+        limit=limit,
+    )
+    return JSONResponse(status_code=200, content=response.model_dump()).body
+
+
+def _current_body(documents, page: int, limit: int) -> bytes:
+    import orjson
+
+    from app.business.document.list_documents import ListDocumentsUseCase
+
+    start = (page - 1) * limit
+    return orjson.dumps(ListDocumentsUseCase.render(documents[start:start + limit], page, limit))
+
+
+def bench_serialization(documents, limits: List[int], repeat: int) -> dict:
+    report = {}
+    for limit in limits:
+        result = {}
+        for name, render in (("legacy", _legacy_body), ("current", _current_body)):
+            render(documents, 1, limit)
+            started = time.perf_counter()
+            for _ in range(repeat):
+                render(documents, 1, limit)
+            result[f"{name}_us"] = (time.perf_counter() - started) / repeat * 1e6
+        result["speedup"] = result["legacy_us"] / result["current_us"]
+        report[str(limit)] = result
+    return report
+
+
+async def bench_http(args) -> dict:
+    import httpx
+    from fastapi import Depends, Response
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from app.infra.database import Base, async_session_maker, engine, get_db
+    from app.infra.repositories import DocumentRepository
+    from app.infra.response_cache import response_cache
+    import main
+
+    engine.echo = False
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    documents = _seed_documents(args.documents)
+    async with async_session_maker() as session:
+        await DocumentRepository(session).upsert_many(documents)
+
+    @main.app.get("/bench/legacy-documents")
+    async def legacy_list_documents(page: int = 1, limit: int = 10, session: AsyncSession = Depends(get_db)):
+        everything = await DocumentRepository(session).get_all()
+        return Response(content=_legacy_body(everything, page, limit), media_type="application/json")
+
+    pages = max(1, args.documents // args.limit)
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        etags = {}
+
+        def getter(path: str, revalidate: bool = False):
+            async def send(index: int) -> int:
+                params = {"page": index % pages + 1, "limit": args.limit}
+                headers = {"If-None-Match": etags[params["page"]]} if revalidate else {}
+                response = await client.get(path, params=params, headers=headers)
+                if "etag" in response.headers:
+                    etags[params["page"]] = response.headers["etag"]
+                return response.status_code
+            return send
+
+        phases = {}
+        phases["legacy"] = await run_phase(
+            "legacy", args.legacy_requests, args.concurrency, getter("/bench/legacy-documents")
+        )
+        saved_size = response_cache.max_entries
+        response_cache.max_entries = 0
+        phases["uncached"] = await run_phase("uncached", args.requests, args.concurrency, getter("/documents/"))
+        response_cache.max_entries = saved_size
+        response_cache.clear()
+        phases["cached"] = await run_phase("cached", args.requests, args.concurrency, getter("/documents/"))
+        phases["revalidated"] = await run_phase(
+            "revalidated", args.requests, args.concurrency, getter("/documents/", revalidate=True)
+        )
+
+    await engine.dispose()
+    for phase in phases.values():
+        phase.pop("stages", None)
+    return phases
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=5000, help="rows in the documents table")
+    parser.add_argument("--requests", type=int, default=1000, help="requests per HTTP phase")
+    parser.add_argument("--legacy-requests", type=int, default=100, help="requests to the previous implementation")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--limit", type=int, default=100, help="page size for HTTP phases")
+    parser.add_argument("--limits", type=int, nargs="+", default=[10, 50, 100], help="page sizes to serialize")
+    parser.add_argument("--repeat", type=int, default=500, help="serializations per page size")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    report = {"config": {key: value for key, value in vars(args).items() if key != "output"}}
+    with tempfile.TemporaryDirectory(prefix="bench-list-") as workdir:
+        # Settings are read at import time, so point them at the scratch area first
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(workdir, 'bench.db')}"
+        os.environ["BLOB_STORAGE_DIR"] = os.path.join(workdir, "blobs")
+        report["serialization"] = bench_serialization(_seed_documents(max(args.limits)), args.limits, args.repeat)
+        report["http"] = asyncio.run(bench_http(args))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""Snapshot export/import and node bootstrap time.
+
+Seeds a source node with synthetic chunks and pre-computed embeddings, exports
+a full snapshot, bootstraps an empty node from it, then repeats with an
+incremental snapshot. A 1M-chunk corpus is the reference size; smaller runs
+report an estimated bootstrap time for 1M chunks, extrapolated linearly from
+their import rate and flagged as an estimate in the report.
+
+Usage:
+    python -m benchmarks.bench_snapshot --chunks 1000000 --dimension 768
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+REFERENCE_CHUNKS = 1_000_000
+
+
+async def make_node(workdir: str, name: str, dimension: int):
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+    from app.infra.database import Base
+    from benchmarks.stub_gateway import StubGeminiGateway
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(workdir, name + '.db')}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    gateway = StubGeminiGateway(persist_directory=os.path.join(workdir, name), dimension=dimension)
+    return engine, sessions, gateway
+
+
+async def seed(sessions, gateway, documents: int, chunks: int, dimension: int, seed: int, uploaded_at):
+    """Insert synthetic documents and chunks with random unit embeddings."""
+    from app.domain.entities import Document
+    from app.infra.repositories import DocumentRepository
+
+    rng = np.random.default_rng(seed)
+    ids = [str(uuid.UUID(bytes=rng.bytes(16))) for _ in range(documents)]
+    async with sessions() as session:
+        await DocumentRepository(session).upsert_many([
+            Document(
+                id=doc_id,
+                filename=f"{doc_id}.pdf",
+                filepath=f"uploaded_files/{doc_id}.pdf",
+                uploaded_at=uploaded_at,
+                mimetype="application/pdf",
+                size=0,
+            )
+            for doc_id in ids
+        ])
+
+    batch = 5000
+    for start in range(0, chunks, batch):
+        count = min(batch, chunks - start)
+        vectors = rng.standard_normal((count, dimension), dtype=np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        positions = range(start, start + count)
+        owners = [ids[position % documents] for position in positions]
+        gateway.upsert_chunks(
+            ids=[f"{owner}:{position}" for owner, position in zip(owners, positions)],
+            embeddings=vectors,
+            documents=[f"Synthetic chunk {position}" for position in positions],
+            metadatas=[{"document_id": owner, "page": position % 50} for owner, position in zip(owners, positions)],
+        )
+    return ids
+
+
+async def export(sessions, gateway, path: str, base=None) -> dict:
+    """Export a full snapshot, or an incremental one on top of ``base``."""
+    from app.business.snapshot import ExportSnapshotUseCase
+    from app.infra.repositories import DocumentRepository
+
+    since = datetime.fromisoformat(base["as_of"]) if base else None
+    started = time.perf_counter()
+    async with sessions() as session:
+        manifest = await ExportSnapshotUseCase(DocumentRepository(session), gateway).execute(
+            path, since=since, base_snapshot_id=base["snapshot_id"] if base else None
+        )
+    return {
+        "seconds": time.perf_counter() - started,
+        "bytes": os.path.getsize(path),
+        "chunks": manifest["counts"].get("chunks.bin", 0),
+        "snapshot_id": manifest["snapshot_id"],
+        "as_of": manifest["as_of"],
+    }
+
+
+async def bootstrap(sessions, gateway, path: str) -> dict:
+    from app.business.snapshot import ImportSnapshotUseCase
+    from app.infra.repositories import BlobRepository, DocumentRepository
+    from app.infra.storage import BlobStore
+
+    started = time.perf_counter()
+    async with sessions() as session:
+        blob_store = BlobStore(BlobRepository(session), root=os.path.join(gateway.chroma_dir, "blobs"))
+        report = await ImportSnapshotUseCase(DocumentRepository(session), gateway, blob_store).execute(path)
+    report["seconds"] = time.perf_counter() - started
+    report["chunks_per_second"] = report["chunks_imported"] / report["seconds"] if report["seconds"] else 0.0
+    return report
+
+
+async def run(args, workdir: str) -> dict:
+    source_engine, source, source_gateway = await make_node(workdir, "source", args.dimension)
+    target_engine, target, target_gateway = await make_node(workdir, "target", args.dimension)
+
+    past = datetime.now(timezone.utc) - timedelta(days=1)
+    started = time.perf_counter()
+    await seed(source, source_gateway, args.documents, args.chunks, args.dimension, args.seed, past)
+    seed_seconds = time.perf_counter() - started
+
+    full_path = os.path.join(workdir, "full.snap")
+    full_export = await export(source, source_gateway, full_path)
+    full_import = await bootstrap(target, target_gateway, full_path)
+
+    # Changes after the full snapshot, shipped as an incremental one
+    delta_chunks = max(1, args.chunks // 100)
+    delta_documents = max(1, args.documents // 100)
+    await seed(source, source_gateway, delta_documents, delta_chunks, args.dimension, args.seed + 1,
+               datetime.now(timezone.utc))
+    incremental_path = os.path.join(workdir, "incremental.snap")
+    incremental_export = await export(source, source_gateway, incremental_path, base=full_export)
+    incremental_import = await bootstrap(target, target_gateway, incremental_path)
+
+    await source_engine.dispose()
+    await target_engine.dispose()
+
+    # Measured directly only when the run is at the reference size
+    rate = full_import["chunks_per_second"]
+    measured = args.chunks >= REFERENCE_CHUNKS
+    return {
+        "config": {"chunks": args.chunks, "documents": args.documents, "dimension": args.dimension},
+        "seed_seconds": seed_seconds,
+        "full": {"export": full_export, "import": full_import},
+        "incremental": {"export": incremental_export, "import": incremental_import},
+        "bootstrap_1m_chunks": {
+            "seconds": full_import["seconds"] if measured else REFERENCE_CHUNKS / rate if rate else None,
+            "estimate": not measured,
+            "basis": (
+                f"measured at {args.chunks} chunks" if measured
+                else f"extrapolated linearly from the {args.chunks}-chunk import rate"
+            ),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunks", type=int, default=100_000)
+    parser.add_argument("--documents", type=int, default=2_000)
+    parser.add_argument("--dimension", type=int, default=768)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench-snapshot-") as workdir:
+        report = asyncio.run(run(args, workdir))
+
+    output = json.dumps(report, indent=2, default=str)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
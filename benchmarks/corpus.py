@@ -0,0 +1,179 @@
+"""Synthetic document generators for benchmarks.
+
+Everything here is pure Python so a corpus can be produced on any machine
+without office tooling. Content is deterministic for a given seed.
+"""
+
+import io
+import random
+import zipfile
+from typing import List
+from xml.sax.saxutils import escape
+
+WORDS = (
+    "retrieval augmented generation document index vector embedding query "
+    "context answer chunk section page model latency throughput storage "
+    "upload search corpus token gateway repository request response cache "
+    "benchmark python server client replica snapshot version migration"
+).split()
+
+
+def paragraphs(count: int, seed: int = 0, words_per_paragraph: int = 80) -> List[str]:
+    """Return ``count`` paragraphs of pseudo-random words."""
+    rng = random.Random(seed)
+    return [
+        " ".join(rng.choice(WORDS) for _ in range(words_per_paragraph)).capitalize() + "."
+        for _ in range(count)
+    ]
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _wrap(text: str, width: int = 90) -> List[str]:
+    lines, line = [], ""
+    for word in text.split():
+        if line and len(line) + len(word) + 1 > width:
+            lines.append(line)
+            line = word
+        else:
+            line = f"{line} {word}" if line else word
+    if line:
+        lines.append(line)
+    return lines
+
+
+def make_pdf(pages: int, seed: int = 0, paragraphs_per_page: int = 4) -> bytes:
+    """Build a minimal valid PDF with ``pages`` pages of Helvetica text."""
+    objects: List[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(b"")  # filled in once the page tree exists
+    page_tree = add(b"")
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    page_ids = []
+    texts = paragraphs(pages * paragraphs_per_page, seed)
+    for page in range(pages):
+        lines = []
+        for paragraph in texts[page * paragraphs_per_page:(page + 1) * paragraphs_per_page]:
+            lines.extend(_wrap(paragraph))
+            lines.append("")
+        ops = ["BT", "/F1 10 Tf", "12 TL", "50 770 Td"]
+        ops.extend(f"({_pdf_escape(line)}) '" for line in lines)
+        ops.append("ET")
+        content = "\n".join(ops).encode("latin-1")
+        stream = add(
+            b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream"
+        )
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>"
+            % (page_tree, font, stream)
+        ))
+
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % page_tree
+    objects[page_tree - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, pages)
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n" % (len(objects) + 1))
+    out.write(b"0000000000 65535 f \n")
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(
+        b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+        % (len(objects) + 1, catalog, xref)
+    )
+    return out.getvalue()
+
+
+def make_text(sections: int, seed: int = 0, paragraphs_per_section: int = 4) -> bytes:
+    texts = paragraphs(sections * paragraphs_per_section, seed)
+    return "\n\n".join(texts).encode("utf-8")
+
+
+def make_markdown(sections: int, seed: int = 0, paragraphs_per_section: int = 4) -> bytes:
+    texts = paragraphs(sections * paragraphs_per_section, seed)
+    parts = []
+    for section in range(sections):
+        parts.append(f"## Section {section + 1}\n")
+        parts.extend(texts[section * paragraphs_per_section:(section + 1) * paragraphs_per_section])
+    return "\n\n".join(parts).encode("utf-8")
+
+
+def make_html(sections: int, seed: int = 0, paragraphs_per_section: int = 4) -> bytes:
+    texts = paragraphs(sections * paragraphs_per_section, seed)
+    parts = ["<!DOCTYPE html><html><head><title>Benchmark</title>",
+             "<style>p { margin: 0 }</style></head><body>"]
+    for section in range(sections):
+        parts.append(f"<h2>Section {section + 1}</h2>")
+        for text in texts[section * paragraphs_per_section:(section + 1) * paragraphs_per_section]:
+            parts.append(f"<p>{escape(text)}</p>")
+    parts.append("</body></html>")
+    return "\n".join(parts).encode("utf-8")
+
+
+_DOCX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    "</Types>"
+)
+_DOCX_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/'
+    '2006/relationships/officeDocument" Target="word/document.xml"/>'
+    "</Relationships>"
+)
+
+
+def make_docx(sections: int, seed: int = 0, paragraphs_per_section: int = 4) -> bytes:
+    texts = paragraphs(sections * paragraphs_per_section, seed)
+    body = []
+    for section in range(sections):
+        body.append(
+            '<w:p><w:pPr><w:pStyle w:val="Heading2"/></w:pPr>'
+            f"<w:r><w:t>Section {section + 1}</w:t></w:r></w:p>"
+        )
+        for text in texts[section * paragraphs_per_section:(section + 1) * paragraphs_per_section]:
+            body.append(f"<w:p><w:r><w:t>{escape(text)}</w:t></w:r></w:p>")
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f"<w:body>{''.join(body)}</w:body></w:document>"
+    )
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", _DOCX_CONTENT_TYPES)
+        archive.writestr("_rels/.rels", _DOCX_RELS)
+        archive.writestr("word/document.xml", document)
+    return out.getvalue()
+
+
+# format name -> (generator, filename extension, declared mimetype)
+GENERATORS = {
+    "pdf": (make_pdf, ".pdf", "application/pdf"),
+    "text": (make_text, ".txt", "text/plain"),
+    "markdown": (make_markdown, ".md", "text/markdown"),
+    "html": (make_html, ".html", "text/html"),
+    "docx": (
+        make_docx,
+        ".docx",
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ),
+}
@@ -0,0 +1,159 @@
+"""Offline evaluation of reduced embedding dimensions.
+
+For each candidate dimension, embeddings are truncated and re-normalized the
+same way ``normalize_embeddings`` does at indexing time, then compared with
+full-dimension search. Reports recall@k, index size and query latency for
+exact (numpy) and Chroma HNSW search.
+
+Embeddings come from an ``.npz`` file with ``documents`` and ``queries``
+arrays, or are generated as stub embeddings whose energy decays across
+dimensions like Matryoshka-trained models.
+
+Usage:
+    python -m benchmarks.eval_dimensions --dimensions 3072 1536 768 256
+    python -m benchmarks.eval_dimensions --corpus embeddings.npz --k 10
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from typing import Optional
+
+import numpy as np
+
+from benchmarks.load_test import percentile
+
+
+def stub_corpus(documents: int, queries: int, dimension: int, topics: int, seed: int):
+    """Clustered embeddings with most of their energy in the leading dimensions."""
+    rng = np.random.default_rng(seed)
+    scale = (np.arange(dimension, dtype=np.float32) + 1) ** -0.5
+    centroids = rng.standard_normal((topics, dimension), dtype=np.float32) * scale
+    owners = rng.integers(0, topics, documents)
+    docs = centroids[owners] + 0.6 * rng.standard_normal((documents, dimension), dtype=np.float32) * scale
+    targets = rng.integers(0, documents, queries)
+    query = docs[targets] + 0.4 * rng.standard_normal((queries, dimension), dtype=np.float32) * scale
+    return docs, query
+
+
+def reduce(vectors: np.ndarray, dimension: int) -> np.ndarray:
+    reduced = np.ascontiguousarray(vectors[:, :dimension], dtype=np.float32)
+    norms = np.linalg.norm(reduced, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return reduced / norms
+
+
+def top_k(docs: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    scores = queries @ docs.T
+    best = np.argpartition(-scores, k, axis=1)[:, :k]
+    order = np.take_along_axis(scores, best, axis=1).argsort(axis=1)[:, ::-1]
+    return np.take_along_axis(best, order, axis=1)
+
+
+def recall(found, truth: np.ndarray) -> float:
+    hits = sum(len(set(row) & set(expected)) for row, expected in zip(found, truth))
+    return hits / truth.size
+
+
+def directory_size(path: str) -> int:
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, files in os.walk(path)
+        for name in files
+    )
+
+
+def eval_exact(docs: np.ndarray, queries: np.ndarray, truth: np.ndarray, k: int) -> dict:
+    latencies = []
+    found = []
+    for query in queries:
+        started = time.perf_counter()
+        found.append(top_k(docs, query[None, :], k)[0])
+        latencies.append((time.perf_counter() - started) * 1000)
+    return {
+        "recall_at_k": recall(found, truth),
+        "index_bytes": docs.nbytes,
+        "p50_query_ms": percentile(latencies, 50),
+        "p95_query_ms": percentile(latencies, 95),
+    }
+
+
+def eval_chroma(docs: np.ndarray, queries: np.ndarray, truth: np.ndarray, k: int, workdir: str) -> dict:
+    import chromadb
+
+    path = os.path.join(workdir, f"chroma-{docs.shape[1]}")
+    client = chromadb.PersistentClient(path=path)
+    collection = client.create_collection("evaluation")
+    started = time.perf_counter()
+    for start in range(0, len(docs), 5000):
+        batch = docs[start:start + 5000]
+        collection.add(ids=[str(i) for i in range(start, start + len(batch))], embeddings=batch)
+    build_seconds = time.perf_counter() - started
+
+    latencies = []
+    found = []
+    for query in queries:
+        started = time.perf_counter()
+        result = collection.query(query_embeddings=query[None, :], n_results=k, include=[])
+        latencies.append((time.perf_counter() - started) * 1000)
+        found.append([int(i) for i in result["ids"][0]])
+    return {
+        "recall_at_k": recall(found, truth),
+        "index_bytes": directory_size(path),
+        "build_seconds": build_seconds,
+        "p50_query_ms": percentile(latencies, 50),
+        "p95_query_ms": percentile(latencies, 95),
+    }
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", help=".npz file with 'documents' and 'queries' arrays")
+    parser.add_argument("--save-corpus", help="write the generated stub corpus to this .npz file")
+    parser.add_argument("--documents", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--full-dimension", type=int, default=3072)
+    parser.add_argument("--topics", type=int, default=50)
+    parser.add_argument("--dimensions", type=int, nargs="+", default=[3072, 1536, 768, 512, 256, 128])
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--no-chroma", action="store_true", help="only evaluate exact search")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    if args.corpus:
+        data = np.load(args.corpus)
+        docs, queries = data["documents"].astype(np.float32), data["queries"].astype(np.float32)
+    else:
+        docs, queries = stub_corpus(args.documents, args.queries, args.full_dimension, args.topics, args.seed)
+        if args.save_corpus:
+            np.savez(args.save_corpus, documents=docs, queries=queries)
+
+    full = docs.shape[1]
+    truth = top_k(reduce(docs, full), reduce(queries, full), args.k)
+    report = {
+        "documents": len(docs),
+        "queries": len(queries),
+        "full_dimension": full,
+        "k": args.k,
+        "dimensions": {},
+    }
+    with tempfile.TemporaryDirectory(prefix="eval-dimensions-") as workdir:
+        for dimension in sorted({d for d in args.dimensions if d <= full}, reverse=True):
+            reduced_docs, reduced_queries = reduce(docs, dimension), reduce(queries, dimension)
+            result = {"exact": eval_exact(reduced_docs, reduced_queries, truth, args.k)}
+            if not args.no_chroma:
+                result["chroma"] = eval_chroma(reduced_docs, reduced_queries, truth, args.k, workdir)
+            report["dimensions"][str(dimension)] = result
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
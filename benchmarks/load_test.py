@@ -0,0 +1,228 @@
+"""End-to-end load test of the documents API against a stub Gemini backend.
+
+Generates a synthetic PDF corpus, uploads it through ``/documents/upload``,
+then drives ``/documents/talk`` and ``/documents/`` with concurrent clients.
+Reports latency percentiles, throughput, peak RSS, per-stage timings and
+counters (including work skipped by cancelled requests) as JSON, optionally
+compared against a saved baseline.
+
+Usage:
+    python -m benchmarks.load_test --documents 50 --pages 10 --concurrency 8 \\
+        --output bench_output.json
+    python -m benchmarks.load_test --baseline bench_output.json --fail-on-regression
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from typing import Awaitable, Callable, List, Optional
+
+from benchmarks.corpus import WORDS, make_pdf
+
+# Metrics where a higher value is worse, compared against the baseline
+LOWER_IS_BETTER = ("p50_ms", "p95_ms", "p99_ms", "peak_rss_mb")
+HIGHER_IS_BETTER = ("throughput_rps",)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of ``values``."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = math.ceil(pct / 100 * len(ordered))
+    return ordered[max(0, min(len(ordered), rank) - 1)]
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+async def run_phase(
+    name: str,
+    total: int,
+    concurrency: int,
+    send: Callable[[int], Awaitable[int]],
+) -> dict:
+    """Issue ``total`` requests from ``concurrency`` workers and summarize them."""
+    from app.infra.metrics import metrics
+
+    metrics.reset()
+    latencies: List[float] = []
+    statuses: dict = {}
+    queue: asyncio.Queue = asyncio.Queue()
+    for index in range(total):
+        queue.put_nowait(index)
+
+    async def worker():
+        while True:
+            try:
+                index = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            started = time.perf_counter()
+            try:
+                status = await send(index)
+            except Exception as e:
+                status = type(e).__name__
+            latencies.append((time.perf_counter() - started) * 1000)
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+
+    ok = sum(count for status, count in statuses.items() if status.startswith("2") or status == "304")
+    return {
+        "requests": total,
+        "errors": total - ok,
+        "statuses": statuses,
+        "wall_seconds": wall,
+        "throughput_rps": total / wall if wall else 0.0,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "max_ms": max(latencies, default=0.0),
+        "peak_rss_mb": peak_rss_mb(),
+        **metrics.snapshot(),
+    }
+
+
+async def run(args, workdir: str) -> dict:
+    import httpx
+
+    from app.infra.database import Base, engine
+    from app.infra.gateway import get_gemini_gateway
+    from benchmarks.stub_gateway import StubGeminiGateway
+    import main
+
+    engine.echo = False
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    gateway = StubGeminiGateway(
+        persist_directory=os.path.join(workdir, "chroma"),
+        dimension=args.dimension,
+        embed_latency=args.embed_latency_ms / 1000,
+        generate_latency=args.generate_latency_ms / 1000,
+        failure_rate=args.failure_rate,
+        seed=args.seed,
+    )
+    main.app.dependency_overrides[get_gemini_gateway] = lambda: gateway
+
+    corpus = [make_pdf(args.pages, seed=args.seed + index) for index in range(args.documents)]
+    rng = random.Random(args.seed)
+    questions = [
+        "What about " + " ".join(rng.choice(WORDS) for _ in range(6)) + "?"
+        for _ in range(args.requests)
+    ]
+    pages = max(1, args.documents // args.page_size)
+    # Deadline sent with talk and upload requests; cancellations show up in counters
+    headers = {"X-Request-Timeout": str(args.request_timeout)} if args.request_timeout else {}
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+
+        async def upload(index: int) -> int:
+            files = {"file": (f"doc-{index}.pdf", corpus[index], "application/pdf")}
+            response = await client.post("/documents/upload", files=files, headers=headers)
+            return response.status_code
+
+        async def talk(index: int) -> int:
+            response = await client.post("/documents/talk", json={"message": questions[index]}, headers=headers)
+            return response.status_code
+
+        async def list_page(index: int) -> int:
+            params = {"page": index % pages + 1, "limit": args.page_size}
+            response = await client.get("/documents/", params=params)
+            return response.status_code
+
+        phases = {}
+        phases["upload"] = await run_phase("upload", args.documents, args.concurrency, upload)
+        phases["talk"] = await run_phase("talk", args.requests, args.concurrency, talk)
+        phases["list"] = await run_phase("list", args.requests, args.concurrency, list_page)
+
+    await engine.dispose()
+    return phases
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> dict:
+    """Relative change of each headline metric against the baseline."""
+    comparison = {"tolerance_percent": tolerance, "regressions": [], "phases": {}}
+    for phase, current in report["phases"].items():
+        previous = baseline.get("phases", {}).get(phase)
+        if previous is None:
+            continue
+        deltas = {}
+        for metric in LOWER_IS_BETTER + HIGHER_IS_BETTER:
+            before, after = previous.get(metric), current.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before * 100
+            deltas[metric] = {"baseline": before, "current": after, "change_percent": change}
+            worse = change > tolerance if metric in LOWER_IS_BETTER else change < -tolerance
+            if worse:
+                comparison["regressions"].append(f"{phase}.{metric}")
+        comparison["phases"][phase] = deltas
+    return comparison
+
+
+def exit_code(report: dict, fail_on_regression: bool) -> int:
+    """1 when regressions were found and should fail the run, else 0."""
+    if fail_on_regression and report.get("comparison", {}).get("regressions"):
+        return 1
+    return 0
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=20, help="synthetic PDFs to upload")
+    parser.add_argument("--pages", type=int, default=5, help="pages per synthetic PDF")
+    parser.add_argument("--requests", type=int, default=200, help="requests per read phase")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--page-size", type=int, default=10, help="limit for list requests")
+    parser.add_argument("--dimension", type=int, default=768, help="stub embedding dimension")
+    parser.add_argument("--embed-latency-ms", type=float, default=0.0)
+    parser.add_argument("--generate-latency-ms", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--request-timeout", type=float, help="X-Request-Timeout for talk and upload, in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--baseline", help="compare against a previously saved report")
+    parser.add_argument("--tolerance", type=float, default=10.0, help="allowed change in percent")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="load-test-") as workdir:
+        # Settings are read at import time, so point them at the scratch area first
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(workdir, 'bench.db')}"
+        os.environ["BLOB_STORAGE_DIR"] = os.path.join(workdir, "blobs")
+        phases = asyncio.run(run(args, workdir))
+
+    config = {key: value for key, value in vars(args).items() if key not in ("output", "baseline")}
+    report = {"config": config, "phases": phases}
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["comparison"] = compare(report, json.load(f), args.tolerance)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    print(output)
+
+    code = exit_code(report, args.fail_on_regression)
+    if code:
+        sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Deterministic local stand-in for the Gemini backend.
+
+Embeddings are hashed bag-of-words vectors, so similar texts land close to
+each other and results are reproducible. Latency and failures are
+configurable to model a slow or flaky upstream.
+"""
+
+import asyncio
+import hashlib
+import math
+import random
+import re
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+from typing import List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+from app.infra.gateway import GeminiGateway, IndexSpec
+from app.infra.metrics import metrics
+
+_TOKEN = re.compile(r"\w+")
+
+
+class StubFailure(RuntimeError):
+    """Injected upstream failure."""
+
+
+class _FailureInjector:
+    def __init__(self, failure_rate: float, seed: int):
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def maybe_fail(self, what: str):
+        if not self.failure_rate:
+            return
+        with self._lock:
+            failed = self._random.random() < self.failure_rate
+        if failed:
+            raise StubFailure(f"Injected {what} failure")
+
+
+def hashed_embedding(text: str, dimension: int) -> List[float]:
+    """Embed ``text`` as a normalized, signed bag of hashed tokens."""
+    vector = [0.0] * dimension
+    for token in _TOKEN.findall(text.lower()):
+        digest = hashlib.blake2b(token.encode(), digest_size=8).digest()
+        bucket = int.from_bytes(digest[:4], "little") % dimension
+        vector[bucket] += 1.0 if digest[4] & 1 else -1.0
+    norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+    return [value / norm for value in vector]
+
+
+class StubEmbeddings(Embeddings):
+    def __init__(
+        self,
+        dimension: int = 768,
+        latency: float = 0.0,
+        failures: Optional[_FailureInjector] = None,
+        model_name: str = "stub-hashed-tokens",
+    ):
+        self.model_name = model_name
+        self.dimension = dimension
+        self.latency = latency
+        self.failures = failures or _FailureInjector(0.0, 0)
+
+    def _embed(self, text: str, stage: str) -> List[float]:
+        with metrics.timed(stage):
+            if self.latency:
+                time.sleep(self.latency)
+            self.failures.maybe_fail("embedding")
+            return hashed_embedding(text, self.dimension)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text, "embed.document") for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text, "embed.query")
+
+
+class StubGenerativeModel:
+    def __init__(self, latency: float = 0.0, failures: Optional[_FailureInjector] = None):
+        self.latency = latency
+        self.failures = failures or _FailureInjector(0.0, 0)
+
+    async def generate_content_async(self, contents, **kwargs):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.failures.maybe_fail("generation")
+        prompt = contents[-1] if contents else ""
+        digest = hashlib.sha256(str(prompt).encode()).hexdigest()[:16]
+        return SimpleNamespace(text=f"Stub answer {digest}")
+
+
+class StubGeminiGateway(GeminiGateway):
+    """GeminiGateway with local embeddings, generation and vector store.
+
+    Extraction, chunking, the index registry and the Chroma vector stores
+    are the real ones, so only the network calls are replaced. Every index
+    version gets hashed embeddings of its configured dimension.
+    """
+
+    def __init__(
+        self,
+        persist_directory: Optional[str] = None,
+        dimension: int = 768,
+        embed_latency: float = 0.0,
+        generate_latency: float = 0.0,
+        failure_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        self.dimension = dimension
+        self.embed_latency = embed_latency
+        self.failures = _FailureInjector(failure_rate, seed)
+        self._stub_model = StubGenerativeModel(generate_latency, self.failures)
+        super().__init__(chroma_dir=persist_directory or tempfile.mkdtemp(prefix="stub-chroma-"))
+
+    def _connect(self):
+        # No SDK configuration or shared chat model; see the model property
+        pass
+
+    def default_index_spec(self) -> IndexSpec:
+        return IndexSpec(
+            version=1,
+            collection="documents",
+            embedding_model="stub-hashed-tokens",
+            embedding_dimension=self.dimension,
+        )
+
+    def make_embeddings(self, spec: IndexSpec) -> StubEmbeddings:
+        return StubEmbeddings(spec.embedding_dimension, self.embed_latency, self.failures, spec.embedding_model)
+
+    @property
+    def model(self):
+        return self._stub_model
@@ -4,12 +4,14 @@ from fastapi import FastAPI
 # and environment variables are set
 from app.domain.config import settings
 
+from app.api.admin.admin import router as admin_router
 from app.api.document.document import router as document_router
 
 app = FastAPI(title="MyDocAssistant API", version="0.1.0")
 
 # Include routers
 app.include_router(document_router)
+app.include_router(admin_router)
 
 
 @app.get("/")
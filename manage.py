@@ -0,0 +1,173 @@
+"""Maintenance commands.
+
+Usage:
+    python manage.py migrate-blobs [--dry-run]
+    python manage.py storage-report
+    python manage.py export-snapshot OUT [--base SNAPSHOT | --since ISO_TIME]
+    python manage.py import-snapshot SNAPSHOT [--no-verify]
+    python manage.py index-status
+    python manage.py reindex [--model M] [--dimension N] [--chunk-size N] [--max-chunks-per-second R]
+    python manage.py reindex --resume [--max-chunks-per-second R]
+    python manage.py abort-reindex
+    python manage.py drop-retired-indexes
+"""
+
+import argparse
+import asyncio
+import json
+from datetime import datetime
+
+# Load configuration early to ensure .env file is loaded
+# and environment variables are set
+from app.domain.config import settings  # noqa: F401
+
+from app.business.index import MigrateIndexUseCase
+from app.business.snapshot import ExportSnapshotUseCase, ImportSnapshotUseCase
+from app.business.storage import MigrateBlobsUseCase
+from app.infra.database import async_session_maker
+from app.infra.gateway import GeminiGateway
+from app.infra.repositories import BlobRepository, DocumentRepository
+from app.infra.snapshot import read_manifest
+from app.infra.storage import BlobStore
+
+
+def _print_report(report: dict):
+    print(json.dumps(report, indent=2, default=str))
+
+
+def _saved_percent(storage: dict) -> float:
+    if not storage["logical_bytes"]:
+        return 0.0
+    return round(100 * storage["saved_bytes"] / storage["logical_bytes"], 2)
+
+
+async def migrate_blobs(args):
+    async with async_session_maker() as session:
+        use_case = MigrateBlobsUseCase(DocumentRepository(session), BlobStore(BlobRepository(session)))
+        report = await use_case.execute(dry_run=args.dry_run)
+    report["storage"]["saved_percent"] = _saved_percent(report["storage"])
+    _print_report(report)
+
+
+async def storage_report(args):
+    async with async_session_maker() as session:
+        storage = await BlobStore(BlobRepository(session)).stats()
+    storage["saved_percent"] = _saved_percent(storage)
+    _print_report(storage)
+
+
+async def export_snapshot(args):
+    since = datetime.fromisoformat(args.since) if args.since else None
+    base_snapshot_id = None
+    if args.base:
+        # Incremental from a previous snapshot: everything after its as_of time
+        base = read_manifest(args.base)
+        since = datetime.fromisoformat(base["as_of"])
+        base_snapshot_id = base["snapshot_id"]
+
+    async with async_session_maker() as session:
+        use_case = ExportSnapshotUseCase(DocumentRepository(session), GeminiGateway())
+        manifest = await use_case.execute(args.output, since=since, base_snapshot_id=base_snapshot_id)
+    _print_report(manifest)
+
+
+async def import_snapshot(args):
+    async with async_session_maker() as session:
+        use_case = ImportSnapshotUseCase(
+            DocumentRepository(session), GeminiGateway(), BlobStore(BlobRepository(session))
+        )
+        report = await use_case.execute(args.snapshot, verify=not args.no_verify)
+    _print_report(report)
+
+
+def _migrate_index_use_case(session) -> MigrateIndexUseCase:
+    return MigrateIndexUseCase(DocumentRepository(session), GeminiGateway())
+
+
+async def index_status(args):
+    async with async_session_maker() as session:
+        _print_report(_migrate_index_use_case(session).status())
+
+
+async def reindex(args):
+    async with async_session_maker() as session:
+        use_case = _migrate_index_use_case(session)
+        if not args.resume:
+            use_case.start(
+                embedding_model=args.model,
+                embedding_dimension=args.dimension,
+                dimension_mode=args.dimension_mode,
+                chunk_size=args.chunk_size,
+                chunk_overlap=args.chunk_overlap,
+            )
+        try:
+            report = await use_case.execute(args.max_chunks_per_second)
+        except asyncio.CancelledError:
+            # Interrupted: leave it resumable right away
+            use_case.pause()
+            raise
+    _print_report(report)
+
+
+async def abort_reindex(args):
+    async with async_session_maker() as session:
+        target = _migrate_index_use_case(session).abort()
+    _print_report({"aborted_version": target.version, "dropped_collection": target.collection})
+
+
+async def drop_retired_indexes(args):
+    async with async_session_maker() as session:
+        dropped = _migrate_index_use_case(session).drop_retired()
+    _print_report({"dropped_versions": dropped})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MyDocAssistant maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser("migrate-blobs", help="move legacy uploads into blob storage")
+    command.add_argument("--dry-run", action="store_true", help="only report what would move")
+    command.set_defaults(handler=migrate_blobs)
+
+    command = commands.add_parser("storage-report", help="show storage saved by dedup and compression")
+    command.set_defaults(handler=storage_report)
+
+    command = commands.add_parser("export-snapshot", help="export the vector index and documents")
+    command.add_argument("output", help="snapshot file to write")
+    incremental = command.add_mutually_exclusive_group()
+    incremental.add_argument("--base", help="only export changes since this snapshot")
+    incremental.add_argument(
+        "--since", help="only export changes since this ISO time; replicas only import --base snapshots"
+    )
+    command.set_defaults(handler=export_snapshot)
+
+    command = commands.add_parser("import-snapshot", help="load a snapshot without embedding calls")
+    command.add_argument("snapshot", help="snapshot file to read")
+    command.add_argument("--no-verify", action="store_true", help="skip the checksum pass")
+    command.set_defaults(handler=import_snapshot)
+
+    command = commands.add_parser("index-status", help="show index versions and migration progress")
+    command.set_defaults(handler=index_status)
+
+    command = commands.add_parser("reindex", help="re-embed the corpus into a new index version")
+    command.add_argument("--resume", action="store_true", help="continue the current migration")
+    command.add_argument("--model", help="embedding model of the new version")
+    command.add_argument("--dimension", type=int, help="embedding dimension of the new version")
+    command.add_argument("--dimension-mode", choices=["api", "truncate"])
+    command.add_argument("--chunk-size", type=int)
+    command.add_argument("--chunk-overlap", type=int)
+    command.add_argument("--max-chunks-per-second", type=float, help="throttle embedding calls")
+    command.set_defaults(handler=reindex)
+
+    command = commands.add_parser("abort-reindex", help="abandon the migration and drop its collection")
+    command.set_defaults(handler=abort_reindex)
+
+    command = commands.add_parser("drop-retired-indexes", help="drop collections of replaced index versions")
+    command.set_defaults(handler=drop_retired_indexes)
+
+    args = parser.parse_args()
+    asyncio.run(args.handler(args))
+
+
+if __name__ == "__main__":
+    main()
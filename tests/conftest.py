@@ -0,0 +1,95 @@
+import os
+import tempfile
+import uuid
+from datetime import datetime, timezone
+
+# Settings are read at import time, so point them at a scratch area before
+# anything under app/ is imported
+_workdir = tempfile.mkdtemp(prefix="tests-")
+os.environ.setdefault("GOOGLE_API_KEY", "test")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(_workdir, 'app.db')}"
+os.environ["BLOB_STORAGE_DIR"] = os.path.join(_workdir, "blobs")
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.domain.entities import Document
+from app.infra.database import Base
+from app.infra.repositories import BlobRepository, DocumentRepository
+from app.infra.storage import BlobStore
+from benchmarks.stub_gateway import StubGeminiGateway
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def make_sessions(tmp_path):
+    """Factory of session factories, one fresh database per name."""
+    engines = []
+
+    async def make(name: str = "test") -> async_sessionmaker:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / (name + '.db')}")
+        engines.append(engine)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        return async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    yield make
+    for engine in engines:
+        await engine.dispose()
+
+
+@pytest.fixture
+async def sessions(make_sessions):
+    """Session factory bound to a fresh database."""
+    return await make_sessions()
+
+
+@pytest.fixture
+def make_gateway(tmp_path):
+    """Factory of stub gateways, one Chroma directory per name."""
+    def make(name: str = "chroma") -> StubGeminiGateway:
+        return StubGeminiGateway(persist_directory=str(tmp_path / name), dimension=16)
+    return make
+
+
+@pytest.fixture
+def gateway(make_gateway) -> StubGeminiGateway:
+    return make_gateway()
+
+
+@pytest.fixture
+def blob_root(tmp_path) -> str:
+    return str(tmp_path / "blobs")
+
+
+@pytest.fixture
+def blob_store(blob_root):
+    """Factory of blob stores on a session, all sharing the test's blob directory."""
+    def make(session) -> BlobStore:
+        return BlobStore(BlobRepository(session), root=blob_root)
+    return make
+
+
+@pytest.fixture
+def store_document(blob_store):
+    """Store ``content`` as a text document's blob and row, without indexing it."""
+    async def store(sessions: async_sessionmaker, content: bytes) -> Document:
+        async def chunks():
+            yield content
+
+        async with sessions() as session:
+            blob = await blob_store(session).put(chunks())
+            return await DocumentRepository(session).create(Document(
+                id=str(uuid.uuid4()),
+                filename="notes.txt",
+                filepath=blob.path,
+                uploaded_at=datetime.now(timezone.utc),
+                mimetype="text/plain",
+                size=blob.size,
+                content_hash=blob.key,
+            ))
+    return store
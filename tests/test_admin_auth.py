@@ -0,0 +1,27 @@
+import httpx
+import pytest
+
+import main
+from app.domain.config import settings
+
+pytestmark = pytest.mark.anyio
+
+
+async def _get_metrics(headers=None) -> int:
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/admin/metrics", headers=headers or {})
+    return response.status_code
+
+
+async def test_admin_is_closed_without_a_token(monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", None)
+    assert await _get_metrics() == 403
+    assert await _get_metrics({"X-Admin-Token": ""}) == 403
+
+
+async def test_admin_requires_the_configured_token(monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "s3cret")
+    assert await _get_metrics() == 403
+    assert await _get_metrics({"X-Admin-Token": "wrong"}) == 403
+    assert await _get_metrics({"X-Admin-Token": "s3cret"}) == 200
@@ -0,0 +1,99 @@
+import asyncio
+import os
+
+import pytest
+
+from app.business.document.delete_document import DeleteDocumentUseCase
+from app.infra.repositories import BlobRepository, DocumentRepository
+
+pytestmark = pytest.mark.anyio
+
+
+async def _chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+async def test_identical_content_shares_one_blob(sessions, blob_store):
+    async with sessions() as session:
+        store = blob_store(session)
+        first = await store.put(_chunks(b"same ", b"content"))
+        second = await store.put(_chunks(b"same content"))
+
+        assert first.key == second.key
+        assert (await store.blob_repository.get(first.key)).refcount == 2
+        assert os.listdir(store.tmp_dir) == []
+
+        assert (await store.release(first.key)).refcount == 1
+        assert os.path.exists(first.path)
+        assert (await store.release(first.key)).refcount == 0
+        assert not os.path.exists(first.path)
+        assert await store.blob_repository.get(first.key) is None
+        assert await store.release(first.key) is None
+
+
+async def test_stored_file_round_trips(sessions, blob_store):
+    from app.infra.storage import open_blob
+
+    content = os.urandom(3 * 1024 * 1024 + 17)
+    async with sessions() as session:
+        blob = await blob_store(session).put(_chunks(content[:1024 * 1024], content[1024 * 1024:]))
+    assert blob.size == len(content)
+    with open_blob(blob.path) as f:
+        assert f.read() == content
+
+
+async def test_concurrent_deletes_release_the_blob_once(sessions, gateway, blob_store, store_document):
+    first = await store_document(sessions, b"shared content")
+    second = await store_document(sessions, b"shared content")
+
+    async def delete(document_id: str) -> bool:
+        async with sessions() as session:
+            use_case = DeleteDocumentUseCase(DocumentRepository(session), gateway, blob_store(session))
+            return await use_case.execute(document_id)
+
+    results = await asyncio.gather(*(delete(first.id) for _ in range(3)))
+    assert sorted(results) == [False, False, True]
+
+    async with sessions() as session:
+        blob = await BlobRepository(session).get(second.content_hash)
+    assert blob.refcount == 1
+    assert os.path.exists(second.filepath)
+
+    assert await delete(second.id)
+    assert not os.path.exists(second.filepath)
+    async with sessions() as session:
+        assert await BlobRepository(session).get(second.content_hash) is None
+
+
+async def test_failed_file_removal_keeps_the_reference(sessions, store_document):
+    document = await store_document(sessions, b"kept content")
+
+    def refuse(blob):
+        raise PermissionError(blob.path)
+
+    async with sessions() as session:
+        with pytest.raises(PermissionError):
+            await DocumentRepository(session).delete(document.id, on_blob_unused=refuse)
+    async with sessions() as session:
+        assert await DocumentRepository(session).get_by_id(document.id) is not None
+        assert (await BlobRepository(session).get(document.content_hash)).refcount == 1
+
+
+async def test_failed_row_delete_can_be_retried(sessions, gateway, blob_store, store_document, monkeypatch):
+    document = await store_document(sessions, b"Retried content " * 50)
+    gateway.index_document(document)
+
+    async def fail(self, *args, **kwargs):
+        raise OSError("database is locked")
+
+    async with sessions() as session:
+        use_case = DeleteDocumentUseCase(DocumentRepository(session), gateway, blob_store(session))
+        with monkeypatch.context() as patch:
+            patch.setattr(DocumentRepository, "delete", fail)
+            with pytest.raises(OSError):
+                await use_case.execute(document.id)
+        # Still listed, so the delete can be retried
+        assert await use_case.execute(document.id)
+    assert gateway.chunk_count() == 0
+    assert not os.path.exists(document.filepath)
@@ -0,0 +1,222 @@
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+from starlette.requests import Request
+
+import main
+from app.api.document.document import _cancelled
+from app.domain.config import settings
+from app.infra.database import Base, async_session_maker, engine
+from app.infra.deadline import ClientDisconnected, Deadline, DeadlineExceeded, get_deadline
+from app.infra.gateway import get_gemini_gateway
+from app.infra.metrics import metrics
+from app.infra.repositories import BlobRepository, DocumentRepository
+from benchmarks.stub_gateway import StubGeminiGateway
+
+pytestmark = pytest.mark.anyio
+
+
+def _count(name: str) -> float:
+    return metrics.snapshot()["counters"].get(name, 0)
+
+
+def test_check_passes_without_a_limit():
+    deadline = Deadline()
+    deadline.check("index")
+    assert deadline.remaining() is None
+    assert deadline.tripped is None
+
+
+def test_check_raises_after_expiry():
+    deadline = Deadline(0.01)
+    time.sleep(0.02)
+    skipped = _count("cancelled.index")
+
+    with pytest.raises(DeadlineExceeded):
+        deadline.check("index")
+    assert deadline.tripped == "deadline"
+    assert _count("cancelled.index") == skipped + 1
+
+
+async def test_check_raises_after_disconnect():
+    deadline = Deadline(60)
+    deadline.cancel()
+
+    with pytest.raises(ClientDisconnected):
+        deadline.check("generate")
+    assert deadline.tripped == "disconnected"
+
+
+async def test_wait_returns_the_result_in_time():
+    async def answer():
+        return 42
+
+    assert await Deadline(60).wait(answer(), "generate") == 42
+
+
+async def test_wait_abandons_work_at_the_deadline():
+    abandoned = asyncio.Event()
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        finally:
+            abandoned.set()
+
+    skipped = _count("cancelled.generate")
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        await Deadline(0.05).wait(slow(), "generate")
+
+    assert time.monotonic() - started < 1
+    assert abandoned.is_set()
+    assert _count("cancelled.generate") == skipped + 1
+
+
+async def test_wait_abandons_work_when_the_client_disconnects():
+    deadline = Deadline(60)
+    asyncio.get_running_loop().call_later(0.02, deadline.cancel)
+
+    with pytest.raises(ClientDisconnected):
+        await deadline.wait(asyncio.sleep(10), "retrieve")
+
+
+@pytest.mark.parametrize("error, status_code", [
+    (DeadlineExceeded("too slow"), 504),
+    (ClientDisconnected("gone"), 499),
+])
+def test_cancellation_status(error, status_code):
+    assert _cancelled(error).status_code == status_code
+
+
+def _request() -> Request:
+    async def receive():
+        await asyncio.Event().wait()
+
+    return Request({"type": "http", "method": "POST", "path": "/", "headers": []}, receive)
+
+
+@pytest.mark.parametrize("header, expected", [(None, 120.0), (2.5, 2.5), (900.0, 30.0)])
+async def test_header_timeout_is_capped(monkeypatch, header, expected):
+    monkeypatch.setattr(settings, "REQUEST_TIMEOUT", 120.0)
+    monkeypatch.setattr(settings, "REQUEST_TIMEOUT_MAX", 30.0)
+    dependency = get_deadline(_request(), header)
+
+    deadline = await dependency.__anext__()
+    await dependency.aclose()
+
+    assert deadline.timeout == expected
+
+
+@pytest.fixture
+async def app_gateway(tmp_path):
+    """Serve the app with a stub gateway configured by the test."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    def install(**options) -> StubGeminiGateway:
+        gateway = StubGeminiGateway(persist_directory=str(tmp_path / "chroma"), dimension=16, **options)
+        main.app.dependency_overrides[get_gemini_gateway] = lambda: gateway
+        return gateway
+
+    yield install
+    main.app.dependency_overrides.pop(get_gemini_gateway, None)
+    await engine.dispose()
+
+
+@pytest.fixture
+async def client(app_gateway):
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+async def test_slow_talk_times_out(app_gateway, client):
+    app_gateway(generate_latency=10)
+    cancelled = _count("requests.cancelled.deadline")
+    skipped = _count("cancelled.generate")
+
+    started = time.monotonic()
+    response = await client.post(
+        "/documents/talk", json={"message": "Anything?"}, headers={"X-Request-Timeout": "0.2"}
+    )
+
+    assert response.status_code == 504
+    assert time.monotonic() - started < 5
+    assert _count("requests.cancelled.deadline") == cancelled + 1
+    assert _count("cancelled.generate") == skipped + 1
+
+
+async def test_non_positive_timeout_is_rejected(app_gateway, client):
+    app_gateway()
+    response = await client.post(
+        "/documents/talk", json={"message": "Anything?"}, headers={"X-Request-Timeout": "0"}
+    )
+    assert response.status_code == 422
+
+
+async def test_upload_cancelled_mid_index_is_discarded(app_gateway, client):
+    # Several batches of slow embeddings, so the deadline passes between them
+    gateway = app_gateway(embed_latency=0.005)
+    content = b"".join(b"Line %d of a long report about quarterly numbers.\n" % n for n in range(8000))
+    discarded = _count("cancelled.uploads_discarded")
+    mid_index = _count("cancelled.index.store") + _count("cancelled.index.extract")
+
+    response = await client.post(
+        "/documents/upload",
+        files={"file": ("report.txt", content, "text/plain")},
+        headers={"X-Request-Timeout": "0.3"},
+    )
+
+    assert response.status_code == 504
+    assert _count("cancelled.index.store") + _count("cancelled.index.extract") == mid_index + 1
+    assert _count("cancelled.uploads_discarded") == discarded + 1
+    async with async_session_maker() as session:
+        assert await DocumentRepository(session).get_all() == []
+        assert (await BlobRepository(session).stats())["references"] == 0
+    assert gateway.chunk_count() == 0
+
+
+async def test_client_disconnect_cancels_talk(app_gateway):
+    app_gateway(generate_latency=10)
+    body = json.dumps({"message": "Anything?"}).encode()
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/documents/talk",
+        "raw_path": b"/documents/talk",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        "client": ("test", 1234),
+        "server": ("test", 80),
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        # The client goes away while the answer is being generated
+        await asyncio.sleep(0.1)
+        return {"type": "http.disconnect"}
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    disconnected = _count("requests.cancelled.disconnected")
+    started = time.monotonic()
+    await main.app(scope, receive, send)
+
+    # The body was read before the watcher started, so the request parsed
+    assert sent[0]["status"] == 499
+    assert time.monotonic() - started < 5
+    assert _count("requests.cancelled.disconnected") == disconnected + 1
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from langchain_chroma import Chroma
+
+from app.infra.gateway import EmbeddingMismatchError, normalize_embeddings, open_vector_store
+from app.infra.gateway.gemini import chroma_collection
+from benchmarks.stub_gateway import StubEmbeddings
+
+
+def test_truncation_renormalizes_to_unit_length():
+    vectors = normalize_embeddings([[3.0, 4.0, 12.0], [1.0, 0.0, 5.0]], dimension=2)
+    assert np.asarray(vectors) == pytest.approx(np.array([[0.6, 0.8], [1.0, 0.0]]))
+
+
+def test_full_size_vectors_are_normalized():
+    vectors = np.asarray(normalize_embeddings(np.random.default_rng(0).standard_normal((4, 64))))
+    assert vectors.shape == (4, 64)
+    assert np.linalg.norm(vectors, axis=1) == pytest.approx(np.ones(4), abs=1e-6)
+
+
+def test_zero_vectors_are_left_alone():
+    assert normalize_embeddings([0.0, 0.0, 0.0, 1.0], dimension=3) == [0.0, 0.0, 0.0]
+    assert normalize_embeddings([[0.0, 0.0]]) == [[0.0, 0.0]]
+
+
+def _open(tmp_path, model: str = "stub-a", dimension: int = 8, name: str = "documents") -> Chroma:
+    return open_vector_store(name, StubEmbeddings(dimension, model_name=model), str(tmp_path))
+
+
+def test_new_collection_records_model_and_dimension(tmp_path):
+    store = _open(tmp_path)
+    metadata = chroma_collection(store).metadata
+    assert (metadata["embedding_model"], metadata["embedding_dimension"]) == ("stub-a", 8)
+    # Reopening with the same settings is fine
+    _open(tmp_path)
+
+
+@pytest.mark.parametrize("model, dimension", [("stub-b", 8), ("stub-a", 16)])
+def test_collection_built_differently_is_refused(tmp_path, model, dimension):
+    _open(tmp_path)
+    with pytest.raises(EmbeddingMismatchError):
+        _open(tmp_path, model=model, dimension=dimension)
+
+
+def _legacy_collection(tmp_path, dimension: int):
+    # Created the way the index was before model and dimension were recorded
+    store = Chroma(
+        collection_name="legacy",
+        embedding_function=StubEmbeddings(dimension),
+        persist_directory=str(tmp_path),
+    )
+    store.add_texts(["Quarterly numbers", "Annual report"], ids=["a:0", "a:1"])
+
+
+def test_legacy_collection_is_backfilled(tmp_path):
+    _legacy_collection(tmp_path, 8)
+    store = _open(tmp_path, name="legacy")
+    metadata = chroma_collection(store).metadata
+    assert (metadata["embedding_model"], metadata["embedding_dimension"]) == ("stub-a", 8)
+    assert chroma_collection(store).count() == 2
+
+
+def test_legacy_collection_with_other_dimension_is_refused(tmp_path):
+    _legacy_collection(tmp_path, 16)
+    with pytest.raises(EmbeddingMismatchError, match="16-dimensional"):
+        _open(tmp_path, name="legacy")
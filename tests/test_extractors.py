@@ -0,0 +1,78 @@
+import codecs
+import io
+
+import pytest
+
+from app.infra.extractors import declared_charset, resolve_extractor
+from app.infra.extractors.html import HtmlExtractor, detect_charset
+from app.infra.extractors.text import TextExtractor
+
+CAFE = "Café crème à la carte"
+
+
+def _html(head: str, body: str = CAFE) -> str:
+    return f"<html><head>{head}</head><body><p>{body}</p></body></html>"
+
+
+def _extract(extractor, content: bytes, charset=None) -> str:
+    return "\n".join(section.text for section in extractor.extract(io.BytesIO(content), charset))
+
+
+@pytest.mark.parametrize("mimetype, expected", [
+    ("text/html; charset=windows-1252", "cp1252"),
+    ('text/plain; Charset="UTF-8"', "utf-8"),
+    ("text/html; charset=no-such-codec", None),
+    ("text/html", None),
+    (None, None),
+])
+def test_declared_charset(mimetype, expected):
+    assert declared_charset(mimetype) == expected
+
+
+@pytest.mark.parametrize("head, expected", [
+    ('<meta charset="windows-1252">', "cp1252"),
+    ("<meta http-equiv='Content-Type' content='text/html; charset=ISO-8859-1'>", "cp1252"),
+    ('<meta charset="shift_jis">', "shift_jis"),
+    ('<meta charset="utf-16">', "utf-8"),
+    ('<meta charset="bogus">', "utf-8"),
+    ("", "utf-8"),
+])
+def test_meta_charset_is_detected(head, expected):
+    assert detect_charset(_html(head).encode("ascii", "replace")) == expected
+
+
+def test_meta_charset_past_the_prescan_is_ignored():
+    content = ("<!--" + " " * 2000 + "-->" + _html('<meta charset="windows-1252">')).encode()
+    assert detect_charset(content) == "utf-8"
+
+
+def test_bom_wins_over_declarations():
+    content = codecs.BOM_UTF8 + _html('<meta charset="windows-1252">').encode()
+    assert detect_charset(content, "cp1252") == "utf-8-sig"
+
+
+def test_html_is_decoded_with_its_meta_charset():
+    content = _html('<meta charset="windows-1252">').encode("cp1252")
+    assert _extract(HtmlExtractor(), content) == CAFE
+
+
+def test_declared_charset_wins_over_meta():
+    content = _html('<meta charset="utf-8">').encode("cp1252")
+    assert _extract(HtmlExtractor(), content, "cp1252") == CAFE
+
+
+def test_html_defaults_to_utf8():
+    assert _extract(HtmlExtractor(), _html("").encode()) == CAFE
+
+
+def test_text_uses_declared_charset():
+    assert _extract(TextExtractor(), CAFE.encode("cp1252"), "cp1252") == CAFE
+
+
+def test_stored_mimetype_keeps_charset_of_text_formats_only():
+    html = resolve_extractor(b"<html>", "text/html; charset=windows-1252", "page.html")
+    pdf = resolve_extractor(b"%PDF-1.7", "application/pdf; charset=windows-1252", "report.pdf")
+
+    assert html.document_mimetype("text/html; charset=windows-1252") == "text/html; charset=cp1252"
+    assert html.document_mimetype("text/html") == "text/html"
+    assert pdf.document_mimetype("application/pdf; charset=windows-1252") == "application/pdf"
@@ -0,0 +1,183 @@
+import asyncio
+import logging
+from datetime import timedelta
+
+import pytest
+from pydantic import ValidationError
+
+from app.business.index import MigrateIndexUseCase
+from app.domain.dto.request import MigrateIndexRequest
+from app.infra.gateway import IndexMigrationError, IndexRegistry, IndexSpec
+from app.infra.repositories import DocumentRepository
+from benchmarks.stub_gateway import StubEmbeddings
+
+STALE_AFTER = timedelta(minutes=5)
+
+
+def _registry(tmp_path) -> IndexRegistry:
+    return IndexRegistry(str(tmp_path), IndexSpec(
+        version=1, collection="documents", embedding_model="stub", embedding_dimension=16,
+    ))
+
+
+def _chunk_count(gateway, spec: IndexSpec) -> int:
+    return gateway.chunk_count(spec)
+
+
+class _SwitchableEmbeddings(StubEmbeddings):
+    broken = False
+
+    def embed_documents(self, texts):
+        if self.broken:
+            raise RuntimeError("embedding backend unavailable")
+        return super().embed_documents(texts)
+
+
+def test_claim_pause_resume_activate(tmp_path):
+    registry = _registry(tmp_path)
+    migration = registry.begin_migration(chunk_size=500, chunk_overlap=50)
+    assert migration.status == "pending"
+    assert registry.write_targets() == [registry.active(), migration.target]
+    with pytest.raises(IndexMigrationError):
+        registry.begin_migration()
+
+    claimed = registry.claim_migration(STALE_AFTER)
+    assert claimed.status == "running"
+    with pytest.raises(IndexMigrationError):
+        registry.claim_migration(STALE_AFTER)
+    # A job that stopped updating is taken over
+    taken_over = registry.claim_migration(timedelta(0))
+    assert taken_over.run_id != claimed.run_id
+
+    registry.update_migration(status="paused")
+    resumed = registry.claim_migration(STALE_AFTER)
+    assert resumed.status == "running"
+    assert resumed.run_id != taken_over.run_id
+
+    with pytest.raises(IndexMigrationError):
+        registry.activate(version=migration.target.version + 1)
+    active = registry.activate(version=migration.target.version)
+    assert (active.version, active.collection, active.chunk_size) == (2, "documents_v2", 500)
+    assert active.activated_at is not None
+    assert registry.migration() is None
+    assert [spec.version for spec in registry.state().retired] == [1]
+
+    # Versions are never reused, even after the retired ones are forgotten
+    registry.forget_retired()
+    assert registry.begin_migration().target.version == 3
+    assert registry.abort().version == 3
+    assert registry.begin_migration().target.version == 4
+
+
+def test_registry_is_shared_through_the_file(tmp_path):
+    first, second = _registry(tmp_path), _registry(tmp_path)
+    migration = first.begin_migration(embedding_dimension=8)
+    assert second.migration().target == migration.target
+    first.claim_migration(STALE_AFTER)
+    first.update_migration(status="failed", error="boom")
+    assert second.write_targets() == [second.active()]
+    assert second.all_targets() == [second.active(), migration.target]
+
+
+def test_invalid_target_settings_are_rejected_before_starting(tmp_path):
+    registry = _registry(tmp_path)
+    # The active overlap of 200 would exceed the new chunk size
+    with pytest.raises(ValueError, match="chunk_overlap"):
+        registry.begin_migration(chunk_size=150)
+    with pytest.raises(ValueError, match="embedding_dimension"):
+        registry.begin_migration(embedding_dimension=4096)
+    assert registry.migration() is None
+    assert registry.begin_migration(chunk_size=150, chunk_overlap=20).target.version == 2
+
+
+def test_request_rejects_inconsistent_chunking():
+    with pytest.raises(ValidationError):
+        MigrateIndexRequest(chunk_size=100, chunk_overlap=100)
+    with pytest.raises(ValidationError):
+        MigrateIndexRequest(embedding_dimension=0)
+    assert MigrateIndexRequest(chunk_size=150).chunk_overlap is None
+
+
+@pytest.mark.anyio
+async def test_migration_rebuilds_the_corpus_and_switches(sessions, gateway, store_document):
+    documents = [await store_document(sessions, f"Document {n} ".encode() * 400) for n in range(3)]
+    for document in documents:
+        gateway.index_document(document)
+    old = gateway.registry.active()
+
+    async with sessions() as session:
+        use_case = MigrateIndexUseCase(DocumentRepository(session), gateway)
+        target = use_case.start(embedding_dimension=8, chunk_size=1000, chunk_overlap=0).target
+        report = await use_case.execute()
+
+    assert report["status"] == "completed"
+    assert report["documents_indexed"] == 3
+    assert gateway.registry.active().version == target.version
+    assert _chunk_count(gateway, target) == report["chunks_indexed"]
+    assert _chunk_count(gateway, target) != _chunk_count(gateway, old)
+
+
+@pytest.mark.anyio
+async def test_failed_dual_write_fails_the_migration_not_the_upload(sessions, gateway, store_document, monkeypatch):
+    monkeypatch.setattr(
+        gateway, "make_embeddings",
+        lambda spec: _SwitchableEmbeddings(spec.embedding_dimension, model_name=spec.embedding_model),
+    )
+    async with sessions() as session:
+        use_case = MigrateIndexUseCase(DocumentRepository(session), gateway)
+        target = use_case.start(embedding_dimension=8).target
+
+    monkeypatch.setattr(_SwitchableEmbeddings, "broken", True)
+    # Only the target is broken: the active store was opened before
+    active_store = gateway.store_for(gateway.registry.active())
+    monkeypatch.setattr(active_store.embeddings, "broken", False)
+    document = await store_document(sessions, b"Quarterly numbers " * 50)
+    gateway.index_document(document)
+
+    migration = gateway.registry.migration()
+    assert migration.status == "failed"
+    assert document.id in migration.error
+    assert _chunk_count(gateway, gateway.registry.active()) > 0
+    assert gateway.registry.write_targets() == [gateway.registry.active()]
+
+    # Once the backend is back, resuming picks the document up
+    monkeypatch.setattr(_SwitchableEmbeddings, "broken", False)
+    async with sessions() as session:
+        report = await MigrateIndexUseCase(DocumentRepository(session), gateway).execute()
+    assert report["status"] == "completed"
+    assert gateway.registry.active().version == target.version
+    assert _chunk_count(gateway, target) > 0
+
+
+class _BrokenRepository:
+    async def get_all(self):
+        raise OSError("database is locked")
+
+
+@pytest.mark.anyio
+async def test_failure_before_the_first_document_is_recorded(gateway):
+    use_case = MigrateIndexUseCase(_BrokenRepository(), gateway)
+    use_case.start(embedding_dimension=8)
+    with pytest.raises(OSError):
+        await use_case.execute()
+
+    migration = gateway.registry.migration()
+    assert migration.status == "failed"
+    assert "database is locked" in migration.error
+    # Failed runs can be resumed right away
+    assert use_case.claim().status == "running"
+
+
+@pytest.mark.anyio
+async def test_failed_background_job_is_logged(caplog):
+    from app.api.admin.admin import _log_migration_failure
+
+    async def fail():
+        raise OSError("database is locked")
+
+    job = asyncio.ensure_future(fail())
+    await asyncio.wait([job])
+    with caplog.at_level(logging.ERROR, logger="app.api.admin.admin"):
+        _log_migration_failure(job)
+    assert caplog.records[0].getMessage() == "Index migration job failed"
+    assert caplog.records[0].exc_info[1] is job.exception()
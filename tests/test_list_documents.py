@@ -0,0 +1,111 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+
+import main
+from app.api.caching import etag_matches
+from app.domain.dto.response import ListDocumentsResponse
+from app.domain.entities import Document
+from app.infra.database import Base, async_session_maker, engine
+from app.infra.metrics import metrics
+from app.infra.repositories import DocumentRepository
+from app.infra.response_cache import response_cache
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def client():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    response_cache.clear()
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+    await engine.dispose()
+
+
+async def _add_documents(count: int):
+    started = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    documents = [
+        Document(
+            id=str(uuid.uuid4()),
+            filename=f"report-{n}.pdf",
+            filepath=f"uploaded_files/report-{n}.pdf",
+            uploaded_at=started + timedelta(seconds=n),
+            mimetype="application/pdf",
+            size=n,
+        )
+        for n in range(count)
+    ]
+    async with async_session_maker() as session:
+        await DocumentRepository(session).upsert_many(documents)
+    return documents
+
+
+async def test_pages_come_in_upload_order(client):
+    documents = await _add_documents(15)
+    response = await client.get("/documents/", params={"page": 2, "limit": 10})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["id"] for item in body["documents"]] == [doc.id for doc in documents[10:]]
+    assert (body["page"], body["limit"]) == (2, 10)
+    assert body["documents"][0]["uploaded_at"].startswith("2026-01-01T00:00:10")
+
+
+async def test_body_matches_the_response_model(client):
+    await _add_documents(3)
+    response = await client.get("/documents/")
+
+    body = response.json()
+    assert ListDocumentsResponse.model_validate(body).model_dump() == body
+
+
+async def test_matching_etag_gets_304_until_the_corpus_changes(client):
+    await _add_documents(3)
+    first = await client.get("/documents/")
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "no-cache"
+
+    for if_none_match in (etag, f"W/{etag}", f'"stale", {etag}', "*"):
+        revalidated = await client.get("/documents/", headers={"If-None-Match": if_none_match})
+        assert revalidated.status_code == 304
+        assert revalidated.content == b""
+        assert revalidated.headers["etag"] == etag
+
+    await _add_documents(1)
+    changed = await client.get("/documents/", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert len(changed.json()["documents"]) == 4
+
+
+def _cache_hits() -> float:
+    return metrics.snapshot()["counters"].get("response_cache.hit", 0)
+
+
+async def test_cached_pages_are_keyed_by_version(client):
+    await _add_documents(2)
+    first = await client.get("/documents/")
+    hits = _cache_hits()
+    again = await client.get("/documents/")
+    assert again.content == first.content
+    assert _cache_hits() == hits + 1
+
+    await _add_documents(1)
+    assert len((await client.get("/documents/")).json()["documents"]) == 3
+
+
+async def test_invalid_paging_is_rejected(client):
+    assert (await client.get("/documents/", params={"page": 0})).status_code == 400
+    assert (await client.get("/documents/", params={"limit": 101})).status_code == 400
+
+
+def test_etag_comparison_is_weak():
+    assert etag_matches('W/"a.1"', '"a.1"')
+    assert not etag_matches('"a.2"', '"a.1"')
+    assert not etag_matches(None, '"a.1"')
@@ -0,0 +1,93 @@
+import threading
+
+import pytest
+
+from app.infra.gateway import GeminiGateway
+from app.infra.metrics import Metrics
+from benchmarks.load_test import compare, exit_code, percentile
+from benchmarks.stub_gateway import StubGeminiGateway
+
+
+def test_timed_and_counters_are_reported():
+    metrics = Metrics()
+    with metrics.timed("index.store"):
+        pass
+    metrics.observe("index.store", 0.5)
+    metrics.increment("cancelled.index")
+    metrics.increment("cancelled.index", 2)
+
+    snapshot = metrics.snapshot()
+    stage = snapshot["stages"]["index.store"]
+    assert stage["count"] == 2
+    assert stage["max_ms"] == 500.0
+    assert stage["mean_ms"] == pytest.approx(stage["total_ms"] / 2)
+    assert snapshot["counters"] == {"cancelled.index": 3}
+
+    metrics.reset()
+    assert metrics.snapshot() == {"stages": {}, "counters": {}}
+
+
+def test_timed_records_failed_blocks():
+    metrics = Metrics()
+    with pytest.raises(ValueError):
+        with metrics.timed("embed.query"):
+            raise ValueError
+    assert metrics.snapshot()["stages"]["embed.query"]["count"] == 1
+
+
+def test_counters_are_thread_safe():
+    metrics = Metrics()
+
+    def work():
+        for _ in range(1000):
+            metrics.increment("requests")
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert metrics.snapshot()["counters"]["requests"] == 8000
+
+
+def test_percentile_uses_nearest_rank():
+    values = [float(n) for n in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 100) == 100.0
+    assert percentile([3.0, 1.0, 2.0], 0) == 1.0
+    assert percentile([], 99) == 0.0
+
+
+def _report(**talk) -> dict:
+    return {"phases": {"talk": {"p95_ms": 100.0, "throughput_rps": 50.0, **talk}}}
+
+
+def test_compare_flags_changes_beyond_the_tolerance():
+    baseline = _report()
+
+    within = compare(_report(p95_ms=105.0, throughput_rps=46.0), baseline, tolerance=10.0)
+    assert within["regressions"] == []
+    assert within["phases"]["talk"]["p95_ms"]["change_percent"] == pytest.approx(5.0)
+
+    slower = compare(_report(p95_ms=120.0, throughput_rps=40.0), baseline, tolerance=10.0)
+    assert slower["regressions"] == ["talk.p95_ms", "talk.throughput_rps"]
+
+    # Improvements are never regressions, and unknown phases are skipped
+    faster = compare({"phases": {**_report(p95_ms=50.0)["phases"], "new": {"p95_ms": 1.0}}}, baseline, 10.0)
+    assert faster["regressions"] == []
+    assert "new" not in faster["phases"]
+
+
+def test_regressions_only_fail_the_run_when_asked():
+    report = {"comparison": compare(_report(p95_ms=200.0), _report(), tolerance=10.0)}
+    assert exit_code(report, fail_on_regression=True) == 1
+    assert exit_code(report, fail_on_regression=False) == 0
+    assert exit_code({}, fail_on_regression=True) == 0
+
+
+def test_stub_gateway_runs_the_real_constructor(tmp_path, monkeypatch):
+    called = []
+    monkeypatch.setattr(GeminiGateway, "__init__", lambda self, chroma_dir=None: called.append(chroma_dir))
+    StubGeminiGateway(persist_directory=str(tmp_path))
+    assert called == [str(tmp_path)]
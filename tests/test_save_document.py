@@ -0,0 +1,65 @@
+import io
+import os
+
+import pytest
+from starlette.datastructures import Headers, UploadFile
+
+from app.business.document.save_document import SaveDocumentUseCase
+from app.domain.dto.request import UploadDocumentRequest
+from app.infra.gateway.gemini import chroma_collection
+from app.infra.repositories import BlobRepository, DocumentRepository
+
+pytestmark = pytest.mark.anyio
+
+
+def _upload(content: bytes, filename: str, content_type: str) -> UploadDocumentRequest:
+    file = UploadFile(
+        io.BytesIO(content),
+        filename=filename,
+        headers=Headers({"content-type": content_type}),
+    )
+    return UploadDocumentRequest(file=file, description=None)
+
+
+async def _save(sessions, gateway, blob_store, request):
+    async with sessions() as session:
+        use_case = SaveDocumentUseCase(DocumentRepository(session), gateway, blob_store(session))
+        return await use_case.execute(request)
+
+
+async def test_upload_is_indexed(sessions, gateway, blob_store):
+    response = await _save(sessions, gateway, blob_store, _upload(b"Plain notes " * 100, "notes.txt", "text/plain"))
+
+    assert os.path.exists(response.filepath)
+    assert gateway.chunk_count() > 0
+
+
+@pytest.mark.parametrize("content, filename, content_type", [
+    (b"PK\x03\x04garbage", "report.docx",
+     "application/vnd.openxmlformats-officedocument.wordprocessingml.document"),
+    (b"%PDF-1.7\ngarbage", "report.pdf", "application/pdf"),
+])
+async def test_unreadable_upload_leaves_nothing_behind(
+    sessions, gateway, blob_store, blob_root, content, filename, content_type
+):
+    with pytest.raises(RuntimeError):
+        await _save(sessions, gateway, blob_store, _upload(content, filename, content_type))
+
+    async with sessions() as session:
+        assert await DocumentRepository(session).get_all() == []
+        assert (await BlobRepository(session).stats())["references"] == 0
+    assert gateway.chunk_count() == 0
+    assert not any(files for _, _, files in os.walk(blob_root))
+
+
+async def test_declared_charset_is_kept_for_indexing(sessions, gateway, blob_store):
+    content = "<html><body><p>Café crème</p></body></html>".encode("cp1252")
+    request = _upload(content, "menu.html", "text/html; charset=windows-1252")
+
+    response = await _save(sessions, gateway, blob_store, request)
+
+    async with sessions() as session:
+        document = await DocumentRepository(session).get_by_id(response.id)
+    assert document.mimetype == "text/html; charset=cp1252"
+    chunks = chroma_collection(gateway.vector_store).get()["documents"]
+    assert chunks == ["Café crème"]
@@ -0,0 +1,124 @@
+from datetime import datetime
+
+import pytest
+
+from app.business.document.delete_document import DeleteDocumentUseCase
+from app.business.snapshot import ExportSnapshotUseCase, ImportSnapshotUseCase
+from app.domain.entities import Document
+from app.infra.repositories import BlobRepository, DocumentRepository
+from app.infra.snapshot import SnapshotError
+
+pytestmark = pytest.mark.anyio
+
+
+class Node:
+    """A database and vector index; nodes share one blob directory."""
+
+    def __init__(self, sessions, gateway, blob_store, store_document):
+        self.sessions = sessions
+        self.gateway = gateway
+        self.blob_store = blob_store
+        self.store_document = store_document
+
+    async def upload(self, text: str) -> Document:
+        document = await self.store_document(self.sessions, text.encode())
+        self.gateway.index_document(document)
+        return document
+
+    async def delete(self, document: Document):
+        async with self.sessions() as session:
+            await DeleteDocumentUseCase(
+                DocumentRepository(session), self.gateway, self.blob_store(session)
+            ).execute(document.id)
+
+    async def export(self, path, base: dict = None) -> dict:
+        async with self.sessions() as session:
+            return await ExportSnapshotUseCase(DocumentRepository(session), self.gateway).execute(
+                str(path),
+                since=datetime.fromisoformat(base["as_of"]) if base else None,
+                base_snapshot_id=base["snapshot_id"] if base else None,
+            )
+
+    async def import_(self, path) -> dict:
+        async with self.sessions() as session:
+            return await ImportSnapshotUseCase(
+                DocumentRepository(session), self.gateway, self.blob_store(session)
+            ).execute(str(path))
+
+    async def document_ids(self) -> set:
+        async with self.sessions() as session:
+            return {doc.id for doc in await DocumentRepository(session).get_all()}
+
+    async def references(self) -> int:
+        async with self.sessions() as session:
+            return (await BlobRepository(session).stats())["references"]
+
+    def chunk_count(self) -> int:
+        return self.gateway.chunk_count()
+
+
+@pytest.fixture
+async def nodes(make_sessions, make_gateway, blob_store, store_document):
+    source = Node(await make_sessions("source"), make_gateway("source"), blob_store, store_document)
+    replica = Node(await make_sessions("replica"), make_gateway("replica"), blob_store, store_document)
+    return source, replica
+
+
+async def test_full_snapshot_round_trip(nodes, tmp_path):
+    source, replica = nodes
+    first = await source.upload("Alpha report " * 300)
+    second = await source.upload("Beta report " * 300)
+    manifest = await source.export(tmp_path / "full.snap")
+
+    report = await replica.import_(tmp_path / "full.snap")
+    assert report["documents_imported"] == 2
+    assert await replica.document_ids() == {first.id, second.id}
+    assert replica.chunk_count() == source.chunk_count()
+    assert await replica.references() == 2
+    assert replica.gateway.registry.active().snapshot_id == manifest["snapshot_id"]
+
+    # Importing the same snapshot again takes no extra references
+    await replica.import_(tmp_path / "full.snap")
+    assert await replica.references() == 2
+
+
+async def test_incremental_snapshot_applies_changes_and_deletes(nodes, tmp_path):
+    source, replica = nodes
+    removed = await source.upload("Alpha report " * 300)
+    kept = await source.upload("Beta report " * 300)
+    full = await source.export(tmp_path / "full.snap")
+    await replica.import_(tmp_path / "full.snap")
+
+    await source.delete(removed)
+    added = await source.upload("Gamma report " * 300)
+    await source.export(tmp_path / "incremental.snap", base=full)
+
+    report = await replica.import_(tmp_path / "incremental.snap")
+    assert report["kind"] == "incremental"
+    assert report["documents_removed"] == 1
+    assert await replica.document_ids() == {kept.id, added.id}
+    assert replica.chunk_count() == source.chunk_count()
+    assert await replica.references() == 2
+    async with replica.sessions() as session:
+        assert await BlobRepository(session).get(removed.content_hash) is None
+
+
+async def test_incremental_snapshot_requires_its_base(nodes, tmp_path):
+    source, replica = nodes
+    await source.upload("Alpha report " * 300)
+    full = await source.export(tmp_path / "full.snap")
+    await source.upload("Beta report " * 300)
+    await source.export(tmp_path / "incremental.snap", base=full)
+
+    # The replica never imported the base snapshot
+    with pytest.raises(SnapshotError, match="builds on"):
+        await replica.import_(tmp_path / "incremental.snap")
+
+    unbased = await source.export(tmp_path / "unbased.snap", base={**full, "snapshot_id": None})
+    assert unbased["base_snapshot_id"] is None
+    await replica.import_(tmp_path / "full.snap")
+    with pytest.raises(SnapshotError, match="no base snapshot"):
+        await replica.import_(tmp_path / "unbased.snap")
+
+    await replica.import_(tmp_path / "incremental.snap")
+    assert len(await replica.document_ids()) == 2